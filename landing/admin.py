@@ -3,13 +3,36 @@ Django Admin configuration for RoyalERP Landing Page
 Provides rich admin UX with list displays, filters, search, and inlines
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.utils.html import format_html
+from .images import get_thumbnail_url
 from .models import (
     LandingPageSettings, Feature, SectionBlock, UseCasePoint,
-    Integration, PricingPlan, Testimonial, StatCounter, FAQ, FooterLink, SectionImage
+    Integration, PricingPlan, Testimonial, StatCounter, FAQ, FooterLink, SectionImage, MediaJob
 )
 
 
+class ProjectedChangeList(ChangeList):
+    """Change list that fetches only the model admin's `list_only` fields"""
+    
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.only(*self.model_admin.list_only) if self.model_admin.list_only else queryset
+
+
+class ProjectedListAdmin(admin.ModelAdmin):
+    """
+    Base admin whose change list declares the fields its columns read in `list_only`
+    Long TextFields (descriptions, SVG, testimonials) are then left out of the list query;
+    the change form still loads every field
+    """
+    
+    list_only = ()
+    
+    def get_changelist(self, request, **kwargs):
+        return ProjectedChangeList
+
+
 @admin.register(LandingPageSettings)
 class LandingPageSettingsAdmin(admin.ModelAdmin):
     """Admin for singleton settings"""
@@ -72,10 +95,11 @@ class LandingPageSettingsAdmin(admin.ModelAdmin):
 
 
 @admin.register(Feature)
-class FeatureAdmin(admin.ModelAdmin):
+class FeatureAdmin(ProjectedListAdmin):
     """Admin for feature cards"""
     
     list_display = ('title', 'image_preview', 'order', 'is_active', 'icon_preview')
+    list_only = ('title', 'image', 'image_renditions', 'order', 'is_active', 'icon')
     list_filter = ('is_active',)
     search_fields = ('title', 'description')
     ordering = ('order',)
@@ -103,18 +127,19 @@ class FeatureAdmin(admin.ModelAdmin):
     def image_preview(self, obj):
         if obj.image:
             return format_html(
-                '<img src="{}" style="width:60px;height:40px;object-fit:cover;border-radius:6px;" />',
-                obj.image.url
+                '<img src="{}" loading="lazy" style="width:60px;height:40px;object-fit:cover;border-radius:6px;" />',
+                get_thumbnail_url(obj.image, obj.image_renditions)
             )
         return '-'
     image_preview.short_description = 'Image'
 
 
 @admin.register(SectionBlock)
-class SectionBlockAdmin(admin.ModelAdmin):
+class SectionBlockAdmin(ProjectedListAdmin):
     """Admin for split sections"""
     
     list_display = ('title', 'key', 'media_type', 'layout_type', 'background_style', 'order', 'is_active')
+    list_only = ('title', 'key', 'media_type', 'layout_type', 'background_style', 'order', 'is_active')
     list_filter = ('is_active', 'layout_type', 'background_style', 'media_type')
     search_fields = ('title', 'key', 'body')
     ordering = ('order',)
@@ -146,10 +171,11 @@ class SectionBlockAdmin(admin.ModelAdmin):
 
 
 @admin.register(UseCasePoint)
-class UseCasePointAdmin(admin.ModelAdmin):
+class UseCasePointAdmin(ProjectedListAdmin):
     """Admin for use case accordion"""
     
     list_display = ('title', 'order', 'is_active')
+    list_only = ('title', 'order', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('title', 'body')
     ordering = ('order',)
@@ -157,10 +183,11 @@ class UseCasePointAdmin(admin.ModelAdmin):
 
 
 @admin.register(Integration)
-class IntegrationAdmin(admin.ModelAdmin):
+class IntegrationAdmin(ProjectedListAdmin):
     """Admin for integration cards"""
     
     list_display = ('name', 'icon_color', 'is_featured', 'order', 'is_active', 'has_icon')
+    list_only = ('name', 'icon_color', 'is_featured', 'order', 'is_active', 'icon', 'icon_svg')
     list_filter = ('is_active', 'is_featured', 'icon_color')
     search_fields = ('name', 'description')
     ordering = ('order',)
@@ -191,10 +218,11 @@ class IntegrationAdmin(admin.ModelAdmin):
 
 
 @admin.register(PricingPlan)
-class PricingPlanAdmin(admin.ModelAdmin):
+class PricingPlanAdmin(ProjectedListAdmin):
     """Admin for pricing plans"""
     
     list_display = ('name', 'price', 'period', 'is_featured', 'order', 'is_active')
+    list_only = ('name', 'price', 'period', 'is_featured', 'order', 'is_active')
     list_filter = ('is_active', 'is_featured')
     search_fields = ('name',)
     ordering = ('order',)
@@ -218,10 +246,11 @@ class PricingPlanAdmin(admin.ModelAdmin):
 
 
 @admin.register(Testimonial)
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(ProjectedListAdmin):
     """Admin for testimonials"""
     
     list_display = ('name', 'company', 'rating_stars', 'order', 'is_active')
+    list_only = ('name', 'company', 'rating', 'order', 'is_active')
     list_filter = ('is_active', 'rating')
     search_fields = ('name', 'company', 'text')
     ordering = ('order',)
@@ -233,10 +262,11 @@ class TestimonialAdmin(admin.ModelAdmin):
 
 
 @admin.register(StatCounter)
-class StatCounterAdmin(admin.ModelAdmin):
+class StatCounterAdmin(ProjectedListAdmin):
     """Admin for stats strip"""
     
     list_display = ('label', 'value', 'order', 'is_active')
+    list_only = ('label', 'value', 'order', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('label',)
     ordering = ('order',)
@@ -244,10 +274,11 @@ class StatCounterAdmin(admin.ModelAdmin):
 
 
 @admin.register(FAQ)
-class FAQAdmin(admin.ModelAdmin):
+class FAQAdmin(ProjectedListAdmin):
     """Admin for FAQ accordion"""
     
     list_display = ('question', 'order', 'is_active')
+    list_only = ('question', 'order', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('question', 'answer')
     ordering = ('order',)
@@ -255,10 +286,11 @@ class FAQAdmin(admin.ModelAdmin):
 
 
 @admin.register(FooterLink)
-class FooterLinkAdmin(admin.ModelAdmin):
+class FooterLinkAdmin(ProjectedListAdmin):
     """Admin for footer links"""
     
     list_display = ('label', 'column_name', 'url', 'order', 'is_active')
+    list_only = ('label', 'column_name', 'url', 'order', 'is_active')
     list_filter = ('is_active', 'column_name')
     search_fields = ('label', 'column_name')
     ordering = ('column_name', 'order')
@@ -266,10 +298,11 @@ class FooterLinkAdmin(admin.ModelAdmin):
 
 
 @admin.register(SectionImage)
-class SectionImageAdmin(admin.ModelAdmin):
+class SectionImageAdmin(ProjectedListAdmin):
     """Admin for section images/avatars"""
     
     list_display = ('image_preview', 'section', 'image_type', 'subtitle', 'order', 'is_active')
+    list_only = ('image', 'image_renditions', 'section', 'image_type', 'subtitle', 'order', 'is_active')
     list_filter = ('is_active', 'section', 'image_type')
     search_fields = ('subtitle', 'alt_text')
     ordering = ('section', 'order')
@@ -296,8 +329,22 @@ class SectionImageAdmin(admin.ModelAdmin):
     def image_preview(self, obj):
         if obj.image:
             return format_html(
-                '<img src="{}" style="width:50px;height:50px;object-fit:cover;border-radius:50%;" />',
-                obj.image.url
+                '<img src="{}" loading="lazy" style="width:50px;height:50px;object-fit:cover;border-radius:50%;" />',
+                get_thumbnail_url(obj.image, obj.image_renditions)
             )
         return '-'
     image_preview.short_description = 'Preview'
+
+
+@admin.register(MediaJob)
+class MediaJobAdmin(admin.ModelAdmin):
+    """Read-only view of the background media queue"""
+    
+    list_display = ('kind', 'model_name', 'object_id', 'status', 'attempts', 'worker', 'updated_at')
+    list_filter = ('status', 'kind', 'model_name')
+    readonly_fields = (
+        'kind', 'model_name', 'object_id', 'status', 'attempts', 'worker', 'error', 'created_at', 'updated_at'
+    )
+    
+    def has_add_permission(self, request):
+        return False
@@ -5,3 +5,8 @@ class LandingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'landing'
     verbose_name = 'Landing Page'
+
+    def ready(self):
+        from . import checks  # noqa: F401 (registers the system checks)
+        from .signals import connect_signals
+        connect_signals()
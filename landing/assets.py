@@ -0,0 +1,78 @@
+"""
+Generated stylesheets for RoyalERP Landing Page
+Builds assets that depend on admin settings into content-addressed media files
+(served with immutable caching) and records their names on LandingPageSettings
+"""
+import hashlib
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template import engines
+from django.template.loader import render_to_string
+
+from .cache import schedule_dependency_bump
+from .utility_css import build_utility_css, get_theme_colors, utility_css_key
+
+
+ASSET_DIR = 'landing/generated'
+THEME_TEMPLATE = 'landing/theme.css'
+
+
+def utilities_key(landing_settings):
+    return utility_css_key(get_theme_colors(landing_settings))
+
+
+def build_utilities(landing_settings):
+    return build_utility_css(get_theme_colors(landing_settings))
+
+
+def theme_key(landing_settings):
+    source = engines['django'].get_template(THEME_TEMPLATE).template.source
+    return hashlib.sha1(repr((sorted(get_theme_colors(landing_settings).items()), source)).encode()).hexdigest()[:16]
+
+
+def build_theme(landing_settings):
+    """Colour variables and gradients from the admin colours (was an inline <style> on every response)"""
+    return render_to_string(THEME_TEMPLATE, {'colors': get_theme_colors(landing_settings)})
+
+
+# kind -> (input key, builder returning the CSS text)
+ASSET_BUILDERS = {
+    'utilities': (utilities_key, build_utilities),
+    'theme': (theme_key, build_theme),
+}
+
+
+def save_asset(kind, content, extension='css'):
+    """Write `content` under a name containing its hash; identical content is reused"""
+    data = content.encode()
+    name = f'{ASSET_DIR}/{kind}-{hashlib.sha1(data).hexdigest()[:12]}.{extension}'
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(data))
+    return name
+
+
+def update_generated_assets(landing_settings, force=False):
+    """
+    Rebuild the generated assets whose inputs changed since they were last written
+    Stored with a queryset update so no further save signals fire
+    Returns the list of rebuilt kinds
+    """
+    assets = dict(landing_settings.generated_assets or {})
+    updated = []
+    for kind, (get_key, build) in ASSET_BUILDERS.items():
+        key = get_key(landing_settings)
+        current = assets.get(kind) or {}
+        if not force and current.get('key') == key:
+            continue
+        name = save_asset(kind, build(landing_settings))
+        if force and current == {'key': key, 'name': name}:
+            continue
+        assets[kind] = {'key': key, 'name': name}
+        updated.append(kind)
+    if updated:
+        type(landing_settings).objects.filter(pk=landing_settings.pk).update(generated_assets=assets)
+        landing_settings.generated_assets = assets
+        landing_settings.invalidate_cache()
+        schedule_dependency_bump([type(landing_settings).__name__])
+    return updated
@@ -0,0 +1,201 @@
+"""
+Cache helpers for RoyalERP Landing Page
+Content versioning, per-dependency versioning, full-page and fragment HTML caching
+Versions live in the default cache, which every process must share (see CACHES and landing.W001)
+"""
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.template import engines
+
+
+CONTENT_VERSION_KEY = 'landing:content-version'
+LAST_MODIFIED_KEY = 'landing:last-modified'
+PAGE_CACHE_PREFIX = 'landing:page'
+DEPENDENCY_VERSION_PREFIX = 'landing:dep-version'
+FRAGMENT_CACHE_PREFIX = 'landing:fragment'
+CRITICAL_CSS_PREFIX = 'landing:critical-css'
+DEFAULT_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint():
+    """
+    Hash of the project templates and the static files manifest this process renders with
+    Part of every version and cache key, so a deploy that changes the markup or the asset
+    URLs changes the ETag and misses the cached HTML even when the content didn't change
+    """
+    digest = hashlib.sha1()
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for root, dirs, files in os.walk(directory):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, directory).encode() + b'\0')
+                    with open(path, 'rb') as fh:
+                        digest.update(hashlib.sha1(fh.read()).digest())
+    digest.update((getattr(staticfiles_storage, 'manifest_hash', None) or '').encode())
+    return digest.hexdigest()[:16]
+
+
+def get_content_version():
+    """
+    Return the current content version: the shared content token plus the code fingerprint
+    A new random token is created if the cache has none yet
+    """
+    token = cache.get(CONTENT_VERSION_KEY)
+    if token is None:
+        cache.add(CONTENT_VERSION_KEY, uuid.uuid4().hex, None)
+        token = cache.get(CONTENT_VERSION_KEY) or uuid.uuid4().hex
+    return f'{token}-{code_fingerprint()}'
+
+
+def bump_content_version():
+    """
+    Replace the content version so every versioned cache entry goes stale
+    Also records the change time used for Last-Modified
+    """
+    cache.set_many({CONTENT_VERSION_KEY: uuid.uuid4().hex, LAST_MODIFIED_KEY: time.time()}, None)
+
+
+def get_last_modified():
+    """
+    Return when landing content last changed (aware UTC datetime)
+    Kept in the cache by every version bump; only a cold cache reads the tables
+    """
+    timestamp = cache.get(LAST_MODIFIED_KEY)
+    if timestamp is None:
+        timestamp = latest_content_modification()
+        cache.add(LAST_MODIFIED_KEY, timestamp, None)
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+
+def latest_content_modification():
+    """Newest updated_at across every landing model, as a Unix timestamp"""
+    from .models import content_models
+
+    latest = [model.objects.aggregate(latest=Max('updated_at'))['latest'] for model in content_models()]
+    latest = [value for value in latest if value is not None]
+    return max(latest).timestamp() if latest else time.time()
+
+
+def dependency_version_key(name):
+    return f'{DEPENDENCY_VERSION_PREFIX}:{name}'
+
+
+def get_dependency_versions(names):
+    """
+    Return {dependency name: version token} for the given dependency names
+    Missing versions are initialised with fresh tokens
+    """
+    keys = {dependency_version_key(name): name for name in names}
+    found = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        found.update(cache.get_many(missing))
+    return {name: found.get(key, '') for key, name in keys.items()}
+
+
+def content_dependencies(instance):
+    """
+    Dependency names affected by a change to `instance`
+    Section images are tracked per section so only that section's fragment goes stale
+    """
+    model_name = type(instance).__name__
+    if model_name == 'SectionImage':
+        sections = {instance.section, getattr(instance, '_previous_section', None)}
+        return [f'{model_name}:{section}' for section in sections if section]
+    return [model_name]
+
+
+def bump_dependency_versions(names):
+    """
+    Invalidate the whole-page version, then fragments depending on `names`
+    Content version first: renders read dependency versions before the snapshot's content
+    version, so a render seeing a new dependency version also loads the new rows
+    """
+    bump_content_version()
+    cache.set_many({dependency_version_key(name): uuid.uuid4().hex for name in names}, None)
+
+
+def schedule_dependency_bump(names):
+    """
+    Bump dependency and content versions once the current transaction commits
+    Bumping before commit would let a concurrent render read the new
+    version together with the old rows and cache stale HTML under it.
+    """
+    names = tuple(names)
+    transaction.on_commit(lambda: bump_dependency_versions(names))
+
+
+def page_cache_enabled():
+    return getattr(settings, 'LANDING_PAGE_CACHE', False)
+
+
+def page_cache_key(version):
+    """Content and snapshot file versions both cover code_fingerprint(), so a deploy misses the old HTML"""
+    return f'{PAGE_CACHE_PREFIX}:{version}'
+
+
+def get_cached_page(version):
+    return cache.get(page_cache_key(version))
+
+
+def set_cached_page(version, content):
+    """
+    Store rendered HTML under the version it was rendered for
+    A render that started before an edit writes under the old version,
+    which no request reads any more, so it can never serve stale content.
+    """
+    timeout = getattr(settings, 'LANDING_PAGE_CACHE_TIMEOUT', DEFAULT_PAGE_CACHE_TIMEOUT)
+    cache.set(page_cache_key(version), content, timeout)
+
+
+def fragment_cache_enabled():
+    return getattr(settings, 'LANDING_FRAGMENT_CACHE', False)
+
+
+def fragment_cache_key(section_key, dependency_versions):
+    """Key a fragment on the code fingerprint and the versions of exactly the dependencies it declares"""
+    parts = [code_fingerprint()] + [f'{name}={dependency_versions[name]}' for name in sorted(dependency_versions)]
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f'{FRAGMENT_CACHE_PREFIX}:{section_key}:{digest}'
+
+
+def get_cached_fragments(keys):
+    return cache.get_many(keys)
+
+
+def set_cached_fragments(fragments):
+    timeout = getattr(settings, 'LANDING_PAGE_CACHE_TIMEOUT', DEFAULT_PAGE_CACHE_TIMEOUT)
+    cache.set_many(fragments, timeout)
+
+
+def critical_css_enabled():
+    return getattr(settings, 'LANDING_CRITICAL_CSS', False)
+
+
+def critical_css_cache_key(version, stylesheets_fingerprint):
+    """Key critical CSS on the content version (which covers the theme) and the stylesheet files"""
+    return f'{CRITICAL_CSS_PREFIX}:{version}:{stylesheets_fingerprint}'
+
+
+def get_cached_critical_css(key):
+    return cache.get(key)
+
+
+def set_cached_critical_css(key, css):
+    timeout = getattr(settings, 'LANDING_PAGE_CACHE_TIMEOUT', DEFAULT_PAGE_CACHE_TIMEOUT)
+    cache.set(key, css, timeout)
@@ -0,0 +1,24 @@
+"""
+System checks for RoyalERP Landing Page
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Content versions must be shared by every process, or saves only reach the process that made them"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'The default cache ({backend}) is not shared between processes',
+        hint='Landing content versions are kept in the default cache; other workers would keep '
+             'serving the old page. Use FileBasedCache, DatabaseCache, Redis or Memcached.',
+        id='landing.W001',
+    )]
@@ -0,0 +1,87 @@
+"""
+Critical CSS for RoyalERP Landing Page
+Extracts the rules the navbar and hero need from the page's stylesheets, to inline in <head>
+while the full stylesheets load without blocking first paint
+"""
+import hashlib
+import os
+import re
+
+from django.contrib.staticfiles import finders
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import critical_css_cache_key, get_cached_critical_css, set_cached_critical_css
+from .css_split import BASE_BUNDLE, SOURCE_NAME, get_css_bundles, split_stylesheet
+
+
+# Above the fold: rendered outside the section fragments / section keys
+CRITICAL_TEMPLATES = ('landing/partials/navbar.html',)
+CRITICAL_SECTIONS = ('hero',)
+
+TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+ATTRIBUTE_RE = re.compile(r'\b(?:class|id)="([^"]*)"')
+
+
+def page_stylesheets(page_sections, landing_settings):
+    """Local paths of the stylesheets the page links, in link order"""
+    bundles = get_css_bundles()
+    if bundles is None:
+        names = [SOURCE_NAME]
+    else:
+        keys = [BASE_BUNDLE] + [section.key for section in page_sections]
+        names = [bundles[key] for key in keys if key in bundles]
+    paths = [finders.find(name) for name in names]
+    generated = landing_settings.generated_assets or {}
+    for kind in ('utilities', 'theme'):  # Linked after the landing.css bundles
+        if generated.get(kind):
+            try:
+                paths.append(default_storage.path(generated[kind]['name']))
+            except NotImplementedError:
+                pass  # Remote storage: still loaded, just not inlined
+    return [path for path in paths if path and os.path.exists(path)]
+
+
+def stylesheets_fingerprint(paths):
+    digest = hashlib.md5()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns}|'.encode())
+    return digest.hexdigest()
+
+
+def html_tokens(html):
+    """Element names, classes and ids present in rendered HTML"""
+    tokens = {tag.lower() for tag in TAG_RE.findall(html)}
+    for value in ATTRIBUTE_RE.findall(html):
+        tokens.update(value.split())
+    return tokens
+
+
+def extract_critical_css(html, css):
+    """Rules of `css` whose selectors can match the elements in `html`"""
+    bundles, _ = split_stylesheet(css, html_tokens(html), {})
+    return bundles.get(BASE_BUNDLE, '')
+
+
+def get_critical_css(request, context, version, page_sections, fragments):
+    """
+    Critical CSS for the page rendered from `context` at content `version`
+    Computed once per content version and set of stylesheet files
+    """
+    paths = page_stylesheets(page_sections, context['settings'])
+    key = critical_css_cache_key(version, stylesheets_fingerprint(paths))
+    css = get_cached_critical_css(key)
+    if css is None:
+        html = ''.join(render_to_string(name, context, request) for name in CRITICAL_TEMPLATES)
+        html += ''.join(
+            fragment for section, fragment in zip(page_sections, fragments) if section.key in CRITICAL_SECTIONS
+        )
+        sources = []
+        for path in paths:
+            with open(path, encoding='utf-8') as fh:
+                sources.append(fh.read())
+        css = extract_critical_css(html, '\n'.join(sources)).replace('</', '<\\/')
+        set_cached_critical_css(key, css)
+    return mark_safe(css)
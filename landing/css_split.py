@@ -0,0 +1,524 @@
+"""
+landing.css bundling for RoyalERP Landing Page
+Drops rules whose selectors match no rendered template and splits the rest into a shared
+bundle plus one bundle per page section, so the page only loads CSS for the sections it renders
+A rule only leaves the shared bundle when that can't reorder it against a rule it competes with
+"""
+import hashlib
+import json
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template import engines
+
+from .sections import SECTIONS
+from .utility_css import CANDIDATE_RE
+
+
+SOURCE_NAME = 'css/landing.css'
+BUNDLE_DIR = 'css/sections'
+MANIFEST_NAME = f'{BUNDLE_DIR}/manifest.json'
+BASE_BUNDLE = 'base'
+
+# Rendered on every page, outside the section partials
+PAGE_TEMPLATES = ('base.html', 'landing/index.html', 'landing/partials/navbar.html')
+PAGE_SCRIPTS = ('js/landing.js',)
+# Markup emitted by template tags (<picture>, <source>...) rather than written in the templates
+TAG_LIBRARY_DIR = os.path.join(os.path.dirname(__file__), 'templatetags')
+
+# At-rules whose block holds further rules
+GROUP_AT_RULES = ('@media', '@supports', '@document', '@layer', '@container')
+
+INCLUDE_RE = re.compile(r'{%\s*include\s+["\']([^"\']+)["\']')
+CLASS_LIST_RE = re.compile(r'classList\.(?:add|toggle|replace)\(([^)]*)\)')
+STRING_RE = re.compile(r'["\']([\w-]+)["\']')
+CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+WORD_RE = re.compile(r'[\w-]+')
+ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:\s*([^;]+)')
+PROPERTY_RE = re.compile(r'(?:^|;)\s*(-{0,2}[a-zA-Z][\w-]*)\s*:([^;]*)')
+WHERE_RE = re.compile(r'(?<!\\):where\((?:[^()]|\([^()]*\))*\)')
+PSEUDO_ARGUMENT_RE = re.compile(r'(?<!\\)(:(?!not\(|is\(|has\()[\w-]+)\((?:[^()]|\([^()]*\))*\)')
+PSEUDO_ELEMENT_RE = re.compile(r'(?<!\\)(?:::[\w-]+|:(?:before|after|first-line|first-letter)\b)')
+PSEUDO_CLASS_RE = re.compile(r'(?<!\\):[\w-]+')
+
+
+# ==================== PARSING ====================
+
+def strip_comments(css):
+    return re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+
+
+def find_outside_strings(css, start, chars):
+    """Index of the first of `chars` at or after `start`, ignoring quoted strings"""
+    quote = None
+    for index in range(start, len(css)):
+        char = css[index]
+        if quote:
+            if char == '\\':
+                continue
+            if char == quote and css[index - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in chars:
+            return index
+    return len(css)
+
+
+def matching_brace(css, open_index):
+    depth = 0
+    index = open_index
+    while index < len(css):
+        index = find_outside_strings(css, index, '{}')
+        if index >= len(css):
+            break
+        depth += 1 if css[index] == '{' else -1
+        if depth == 0:
+            return index
+        index += 1
+    raise ValueError('Unbalanced braces in stylesheet')
+
+
+def parse(css):
+    """
+    Parse a comment-free stylesheet into nodes:
+    ('rule', selector text, body), ('group', prelude, [children]),
+    ('block', prelude, body) for other at-rules with a block, ('statement', text)
+    """
+    nodes = []
+    pos = 0
+    while True:
+        while pos < len(css) and css[pos].isspace():
+            pos += 1
+        if pos >= len(css):
+            return nodes
+        end = find_outside_strings(css, pos, '{;}')
+        if end >= len(css):
+            return nodes
+        prelude = css[pos:end].strip()
+        if css[end] == ';':
+            nodes.append(('statement', prelude + ';'))
+            pos = end + 1
+            continue
+        if css[end] == '}':
+            pos = end + 1  # Stray closing brace
+            continue
+        close = matching_brace(css, end)
+        body = css[end + 1:close]
+        if prelude.startswith('@'):
+            if prelude.split()[0].lower() in GROUP_AT_RULES:
+                nodes.append(('group', prelude, parse(body)))
+            else:
+                nodes.append(('block', prelude, body))
+        else:
+            nodes.append(('rule', prelude, body))
+        pos = close + 1
+
+
+def split_selectors(selector_text):
+    """Split a selector list on top-level commas"""
+    selectors, depth, current = [], 0, ''
+    for char in selector_text:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+    selectors.append(current)
+    return [' '.join(selector.split()) for selector in selectors if selector.strip()]
+
+
+def minify_body(body):
+    body = re.sub(r'\s+', ' ', body.strip())
+    body = re.sub(r'\s*([{};])\s*', r'\1', body)
+    body = re.sub(r'(?<=[\w-]):\s+', ':', body)
+    return body.replace(';}', '}').rstrip(';')
+
+
+# ==================== MATCHING ====================
+
+def selector_tokens(selector):
+    """Class, id and element names an element tree must contain for `selector` to match"""
+    text = re.sub(r'(?<!\\)::?[\w-]+\((?:[^()]|\([^()]*\))*\)', ' ', selector)  # :not(), :nth-child()...
+    text = re.sub(r'(?<!\\)::?[\w-]+', ' ', text)
+    text = re.sub(r'\[[^\]]*\]', ' ', text)
+    names = [name.replace('\\', '') for name in re.findall(r'[.#]((?:[\w-]|\\.)+)', text)]
+    text = re.sub(r'[.#](?:[\w-]|\\.)+', ' ', text)
+    tags = re.findall(r'(?<![\w-])([a-zA-Z][\w-]*)', text)
+    return set(names) | {tag.lower() for tag in tags}
+
+
+def template_source(name, seen):
+    """Source of a template plus everything it includes"""
+    if name in seen:
+        return ''
+    seen.add(name)
+    source = engines['django'].get_template(name).template.source
+    return source + ''.join(template_source(child, seen) for child in INCLUDE_RE.findall(source))
+
+
+def words(text):
+    return set(WORD_RE.findall(text)) | set(CANDIDATE_RE.findall(text))
+
+
+def collect_scopes():
+    """Words used by the page shell and by each section partial"""
+    page = ''.join(template_source(name, set()) for name in PAGE_TEMPLATES)
+    for name in PAGE_SCRIPTS:
+        path = finders.find(name)
+        if path:
+            with open(path, encoding='utf-8') as fh:
+                page += fh.read()
+    for filename in sorted(os.listdir(TAG_LIBRARY_DIR)):
+        if filename.endswith('.py'):
+            with open(os.path.join(TAG_LIBRARY_DIR, filename), encoding='utf-8') as fh:
+                page += fh.read()
+    sections = {section.key: words(template_source(section.template, set())) for section in SECTIONS}
+    return words(page), sections
+
+
+def collect_class_sets():
+    """
+    Class sets of the elements written in the templates and tag libraries, plus the classes
+    scripts may add to any element
+    """
+    sources = [template_source(name, set()) for name in PAGE_TEMPLATES]
+    sources += [template_source(section.template, set()) for section in SECTIONS]
+    for filename in sorted(os.listdir(TAG_LIBRARY_DIR)):
+        if filename.endswith('.py'):
+            with open(os.path.join(TAG_LIBRARY_DIR, filename), encoding='utf-8') as fh:
+                sources.append(fh.read())
+    class_sets = {
+        frozenset(WORD_RE.findall(double or single))
+        for source in sources for double, single in CLASS_ATTR_RE.findall(source)
+    }
+    for name in PAGE_SCRIPTS:
+        path = finders.find(name)
+        if path:
+            with open(path, encoding='utf-8') as fh:
+                sources.append(fh.read())
+    scripted = {
+        name for source in sources for arguments in CLASS_LIST_RE.findall(source)
+        for name in STRING_RE.findall(arguments)
+    }
+    return class_sets, scripted
+
+
+# ==================== CASCADE ORDER ====================
+
+def specificity(selector):
+    """(ids, classes + attributes + pseudo-classes, types + pseudo-elements) of one selector"""
+    text = WHERE_RE.sub(' ', selector)
+    text = PSEUDO_ARGUMENT_RE.sub(r'\1', text)  # :nth-child(2n+1) -> :nth-child; :not() keeps its argument
+    attributes = len(re.findall(r'\[[^\]]*\]', text))
+    text = re.sub(r'\[[^\]]*\]', ' ', text)
+    pseudo_elements = len(PSEUDO_ELEMENT_RE.findall(text))
+    text = PSEUDO_ELEMENT_RE.sub(' ', text)
+    pseudo_classes = len([name for name in PSEUDO_CLASS_RE.findall(text) if name not in (':not', ':is', ':has')])
+    text = PSEUDO_CLASS_RE.sub(' ', text)
+    ids = len(re.findall(r'#(?:[\w-]|\\.)+', text))
+    classes = len(re.findall(r'\.(?:[\w-]|\\.)+', text))
+    text = re.sub(r'[.#](?:[\w-]|\\.)+', ' ', text)
+    types = len(re.findall(r'(?<![\w-])[a-zA-Z][\w-]*', text))
+    return ids, classes + attributes + pseudo_classes, types + pseudo_elements
+
+
+def subject(selector):
+    """
+    The compound selector naming the styled element (the part after the last combinator)
+    Returns (type, ids, classes, pseudo-element)
+    """
+    compounds, depth, current = [], 0, ''
+    for char in selector:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if depth == 0 and (char.isspace() or char in '>+~'):
+            compounds.append(current)
+            current = ''
+        else:
+            current += char
+    compound = [part for part in compounds + [current] if part][-1]
+    compound = re.sub(r'(?<!\\):[\w-]+\((?:[^()]|\([^()]*\))*\)', '', compound)
+    compound = re.sub(r'\[[^\]]*\]', '', compound)
+    pseudo = PSEUDO_ELEMENT_RE.search(compound)
+    type_name = re.match(r'[a-zA-Z][\w-]*', compound)
+    return (
+        type_name.group(0).lower() if type_name else None,
+        frozenset(name.replace('\\', '') for name in re.findall(r'#((?:[\w-]|\\.)+)', compound)),
+        frozenset(name.replace('\\', '') for name in re.findall(r'\.((?:[\w-]|\\.)+)', compound)),
+        pseudo.group(0).lstrip(':') if pseudo else None,
+    )
+
+
+def property_keys(body):
+    """
+    (declared, covered) property names of a rule body; `covered` adds the shorthands a longhand
+    belongs to (transition-duration -> transition), so two rules overlap when either's declared
+    names meet the other's covered names. !important declarations only compete among themselves
+    """
+    declared, covered = set(), set()
+    for name, value in PROPERTY_RE.findall(body):
+        important = '!' if '!important' in value.replace(' ', '').lower() else ''
+        name = name.lower()
+        if not name.startswith('--'):
+            name = re.sub(r'^-[a-z]+-', '', name)  # -webkit-transition competes with transition
+            parts = name.split('-')
+            covered |= {'-'.join(parts[:count]) + important for count in range(1, len(parts))}
+        declared.add(name + important)
+        covered.add(name + important)
+    return frozenset(declared), frozenset(covered)
+
+
+class SelectorEntry:
+    """One selector of one rule in landing.css, with what decides its place in the cascade"""
+
+    __slots__ = ('key', 'selector', 'bundle', 'specificity', 'declared', 'covered', 'subject')
+
+    def __init__(self, key, selector, body, bundle):
+        self.key = key
+        self.selector = selector
+        self.bundle = bundle
+        self.specificity = specificity(selector)
+        self.declared, self.covered = property_keys(body)
+        self.subject = subject(selector)
+
+
+class CascadeOrder:
+    """Decides whether two same-specificity rules depend on their source order"""
+
+    def __init__(self, class_sets, scripted):
+        self.class_sets = class_sets
+        self.static_classes = set().union(*class_sets) - scripted
+
+    def same_element(self, first, second):
+        """Whether one element can match both subjects (from the class sets in the templates)"""
+        type_a, ids_a, classes_a, pseudo_a = first.subject
+        type_b, ids_b, classes_b, pseudo_b = second.subject
+        if pseudo_a != pseudo_b or (type_a and type_b and type_a != type_b) or (ids_a and ids_b and ids_a != ids_b):
+            return False
+        # Classes scripts add, or that never appear in markup, may be on any element
+        required = (classes_a | classes_b) & self.static_classes
+        return not required or any(required <= classes for classes in self.class_sets)
+
+    def conflict(self, first, second):
+        return (
+            first.specificity == second.specificity
+            and bool(first.declared & second.covered or second.declared & first.covered)
+            and self.same_element(first, second)
+        )
+
+    def inversions(self, entries, position):
+        """
+        (earlier, later) pairs of conflicting entries that `position` puts in the wrong order
+        `entries` are in source order; `position` maps an entry to its place in the linked CSS
+        """
+        by_specificity = {}
+        for entry in entries:
+            by_specificity.setdefault(entry.specificity, []).append(entry)
+        for group in by_specificity.values():
+            for index, later in enumerate(group):
+                for earlier in group[:index]:
+                    if position(earlier) > position(later) and self.conflict(earlier, later):
+                        yield earlier, later
+
+
+# ==================== SPLITTING ====================
+
+class Splitter:
+    """Assigns every selector to the shared bundle, one section's bundle, or nothing (dead)"""
+
+    def __init__(self, page_words, section_words, cascade=None):
+        self.page_words = page_words
+        self.section_words = section_words
+        self.cascade = cascade
+        # Bundles are linked shared bundle first, then the sections in SECTIONS order
+        self.link_order = {BASE_BUNDLE: 0, **{key: index for index, key in enumerate(section_words, 1)}}
+        self.dead_selectors = 0
+        self.dead_bytes = 0
+        self.kept_in_order = 0
+
+    def bundle_for(self, selector):
+        required = selector_tokens(selector)
+        if required <= self.page_words:
+            return BASE_BUNDLE
+        hits = [key for key, found in self.section_words.items() if required <= found | self.page_words]
+        if not hits:
+            return None
+        return hits[0] if len(hits) == 1 else BASE_BUNDLE
+
+    def collect(self, nodes, context=()):
+        """A SelectorEntry with its tentative bundle for every selector in `nodes`, in source order"""
+        entries = []
+        for node in nodes:
+            if node[0] == 'rule':
+                _, selector_text, body = node
+                body = minify_body(body)
+                for selector in split_selectors(selector_text):
+                    entries.append(SelectorEntry((context, selector, body), selector, body, self.bundle_for(selector)))
+            elif node[0] == 'group':
+                entries += self.collect(node[2], context + (node[1],))
+        return entries
+
+    def keep_cascade_order(self, entries):
+        """
+        Move rules to the shared bundle until no rule lands after a later rule of the same
+        specificity that can style the same element (e.g. .tilt-3d:hover, which must stay
+        before .section-image-item:hover)
+        """
+        if self.cascade is None:
+            return  # Nothing is split off (critical CSS)
+        live = [entry for entry in entries if entry.bundle is not None]
+
+        def position(entry):
+            return self.link_order[entry.bundle]
+
+        while True:
+            moved = {earlier for earlier, _ in self.cascade.inversions(live, position)}
+            if not moved:
+                return
+            for entry in moved:
+                entry.bundle = BASE_BUNDLE
+            self.kept_in_order += len(moved)
+
+    def split_rules(self, nodes, entries):
+        """
+        Return {bundle: [serialized nodes]} for `nodes`, keyframes resolved separately
+        `entries` iterates over collect(nodes) and gives each selector's bundle
+        """
+        output, keyframes = {}, []
+        for node in nodes:
+            kind = node[0]
+            if kind == 'rule':
+                _, selector_text, body = node
+                body = minify_body(body)
+                by_bundle = {}
+                for selector in split_selectors(selector_text):
+                    bundle = next(entries).bundle
+                    if bundle is None:
+                        self.dead_selectors += 1
+                        self.dead_bytes += len(selector) + 1
+                    else:
+                        by_bundle.setdefault(bundle, []).append(selector)
+                if not by_bundle:
+                    self.dead_bytes += len(body) + 2
+                for bundle, selectors in by_bundle.items():
+                    output.setdefault(bundle, []).append(f'{",".join(selectors)}{{{body}}}')
+            elif kind == 'group':
+                _, prelude, children = node
+                inner, inner_keyframes = self.split_rules(children, entries)
+                keyframes += inner_keyframes
+                for bundle, rules in inner.items():
+                    output.setdefault(bundle, []).append(f'{prelude}{{{"".join(rules)}}}')
+            elif kind == 'block' and node[1].split()[0].lower().endswith('keyframes'):
+                keyframes.append(node)
+            elif kind == 'block':
+                output.setdefault(BASE_BUNDLE, []).append(f'{node[1]}{{{minify_body(node[2])}}}')
+            else:
+                output.setdefault(BASE_BUNDLE, []).append(node[1])
+        return output, keyframes
+
+    def place_keyframes(self, output, keyframes):
+        """Put each @keyframes in the bundle of the rules that use it"""
+        for _, prelude, body in keyframes:
+            name = prelude.split(None, 1)[1].strip()
+            users = {
+                bundle for bundle, rules in output.items()
+                if any(re.search(r'(?<![\w-])%s(?![\w-])' % re.escape(name), value)
+                       for rule in rules for value in ANIMATION_RE.findall(rule))
+            }
+            if name in self.page_words:
+                users.add(BASE_BUNDLE)  # Inline styles or scripts
+            users |= {key for key, found in self.section_words.items() if name in found}
+            serialized = f'{prelude}{{{minify_body(body)}}}'
+            if not users:
+                self.dead_bytes += len(serialized)
+                continue
+            bundle = users.pop() if len(users) == 1 else BASE_BUNDLE
+            output.setdefault(bundle, []).append(serialized)
+
+
+def split_stylesheet(css, page_words, section_words, cascade=None):
+    """Returns ({bundle: css text}, splitter with dead-rule statistics)"""
+    splitter = Splitter(page_words, section_words, cascade)
+    nodes = parse(strip_comments(css))
+    entries = splitter.collect(nodes)
+    splitter.keep_cascade_order(entries)
+    output, keyframes = splitter.split_rules(nodes, iter(entries))
+    splitter.place_keyframes(output, keyframes)
+    return {bundle: '\n'.join(rules) + '\n' for bundle, rules in output.items()}, splitter
+
+
+def cascade_inversions(css, bundles, splitter):
+    """
+    Check the bundles as the page links them against landing.css: every pair of rules whose
+    relative order decides the cascade must appear in the same order as in the source
+    Returns the inverted (earlier, later) source entries
+    """
+    linked, position = {}, 0
+    for bundle in sorted(bundles, key=splitter.link_order.__getitem__):
+        for entry in splitter.collect(parse(bundles[bundle])):
+            linked.setdefault(entry.key, []).append(position)
+            position += 1
+    source = splitter.collect(parse(strip_comments(css)))
+    positions = {}
+    for entry in source:
+        if linked.get(entry.key):
+            positions[id(entry)] = linked[entry.key].pop(0)
+    placed = [entry for entry in source if id(entry) in positions]
+    return list(splitter.cascade.inversions(placed, lambda entry: positions[id(entry)]))
+
+
+# ==================== BUNDLES ====================
+
+def source_hash(css):
+    return hashlib.sha1(css.encode()).hexdigest()[:16]
+
+
+def bundle_output_dir():
+    return os.path.join(settings.STATICFILES_DIRS[0], BUNDLE_DIR)
+
+
+def write_bundles(bundles, css):
+    """Write the bundles and a manifest recording which landing.css they came from"""
+    output_dir = bundle_output_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    for filename in os.listdir(output_dir):
+        if filename.endswith('.css'):
+            os.unlink(os.path.join(output_dir, filename))
+    names = {}
+    for bundle, text in bundles.items():
+        names[bundle] = f'{BUNDLE_DIR}/{bundle}.css'
+        with open(os.path.join(output_dir, f'{bundle}.css'), 'w', encoding='utf-8') as fh:
+            fh.write(text)
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as fh:
+        json.dump({'source': source_hash(css), 'bundles': names}, fh, indent=2, sort_keys=True)
+    return names
+
+
+_bundles_cache = {}
+
+
+def get_css_bundles():
+    """
+    {bundle: static path} of the section bundles, or None when they haven't been built
+    or landing.css changed since (the page then links the full stylesheet)
+    """
+    manifest_path, source_path = finders.find(MANIFEST_NAME), finders.find(SOURCE_NAME)
+    if not manifest_path or not source_path:
+        return None
+    key = (os.stat(manifest_path).st_mtime_ns, os.stat(source_path).st_mtime_ns)
+    if _bundles_cache.get('key') != key:
+        with open(manifest_path, encoding='utf-8') as fh:
+            manifest = json.load(fh)
+        with open(source_path, encoding='utf-8') as fh:
+            current = source_hash(fh.read())
+        _bundles_cache.update(key=key, bundles=manifest['bundles'] if manifest.get('source') == current else None)
+    return _bundles_cache['bundles']
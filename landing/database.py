@@ -0,0 +1,45 @@
+"""
+Database helpers for RoyalERP Landing Page
+SQLite connection profile (WAL, synchronous, cache and mmap sizes, busy timeout) and query recording
+"""
+import re
+
+from django.conf import settings
+
+
+PRAGMA_NAME_RE = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE_RE = re.compile(r'^(-?\d+|[A-Za-z_]+)$')
+
+
+def pragma_statements(pragmas):
+    """PRAGMA statements for {name: value}; pragmas can't take parameters, so both are validated"""
+    statements = []
+    for name, value in pragmas.items():
+        if not PRAGMA_NAME_RE.match(name) or not PRAGMA_VALUE_RE.match(str(value)):
+            raise ValueError(f'Invalid SQLite pragma {name}={value!r}')
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def get_sqlite_pragmas():
+    return getattr(settings, 'LANDING_SQLITE_PRAGMAS', {})
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """connection_created hook: apply LANDING_SQLITE_PRAGMAS to each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(get_sqlite_pragmas()):
+            cursor.execute(statement)
+
+
+class QueryRecorder:
+    """Execute wrapper that keeps (sql, params) of every query"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
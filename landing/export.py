@@ -0,0 +1,189 @@
+"""
+Static export for RoyalERP Landing Page
+Renders the landing page to a directory that nginx or a CDN can serve without Python
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import HttpRequest
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent exports are not serialized
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.export-manifest.json'
+LOCK_NAME = '.export.lock'
+INDEX_NAME = 'index.html'
+
+
+class ExportError(Exception):
+    pass
+
+
+def get_export_dir():
+    return getattr(settings, 'LANDING_EXPORT_DIR', None)
+
+
+def render_page_html():
+    """Render the landing page as an anonymous GET of /"""
+    from .views import render_landing_page
+
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = '/'
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    return render_landing_page(request).content.decode()
+
+
+def asset_url_pattern():
+    """Match STATIC_URL/MEDIA_URL references inside the rendered HTML"""
+    prefixes = '|'.join(re.escape(prefix) for prefix in (settings.STATIC_URL, settings.MEDIA_URL))
+    return re.compile(r'(?P<prefix>%s)(?P<path>[^"\'\s,)?#]+)(?P<query>\?[^"\'\s,)#]*)?' % prefixes)
+
+
+def find_static_file(name):
+    """Locate a static file in the collected tree first, then in the finders"""
+    if staticfiles_storage.exists(name):
+        try:
+            return staticfiles_storage.path(name)
+        except NotImplementedError:
+            pass
+    return finders.find(name)
+
+
+def find_media_file(name):
+    if not default_storage.exists(name):
+        return None
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        raise ExportError(f'Media storage has no local path for {name}')
+
+
+def collect_artifacts(base_url=''):
+    """
+    Render the page and resolve every static/media file it references
+    Returns {relative export path: bytes (rendered) or str (source file path)}
+    """
+    html = render_page_html()
+    artifacts = {}
+    base_url = base_url.rstrip('/') + '/' if base_url else ''
+
+    def rewrite(match):
+        prefix, path = match.group('prefix'), match.group('path')
+        if prefix == settings.STATIC_URL:
+            export_path, source = f'static/{path}', find_static_file(path)
+        else:
+            export_path, source = f'media/{path}', find_media_file(path)
+        if source is None:
+            return match.group(0)  # Leave unknown references untouched
+        artifacts[export_path] = source
+        return base_url + export_path
+
+    artifacts[INDEX_NAME] = asset_url_pattern().sub(rewrite, html).encode()
+    return artifacts
+
+
+def fingerprint(content):
+    """Cheap change marker: content hash for rendered bytes, size+mtime for files"""
+    if isinstance(content, bytes):
+        return hashlib.sha256(content).hexdigest()
+    stat = os.stat(content)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def atomic_write(path, content):
+    """Write to a temp file in the same directory and rename it over the target"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.export-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            if isinstance(content, bytes):
+                tmp.write(content)
+            else:
+                with open(content, 'rb') as source:
+                    for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                        tmp.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def export_landing(target_dir, base_url='', force=False):
+    """
+    Export the landing page to `target_dir`, rewriting only changed artifacts
+    Assets are swapped in before index.html so the live HTML never references a
+    missing file; artifacts no longer referenced are removed afterwards.
+    Concurrent exports (admin saves, finished media jobs) are serialized with a lock file,
+    so each one renders, writes and prunes against the manifest the previous one left
+    Returns (number of artifacts, list of rewritten paths)
+    """
+    target_dir = os.fspath(target_dir)
+    os.makedirs(target_dir, exist_ok=True)
+    with open(os.path.join(target_dir, LOCK_NAME), 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        return write_export(target_dir, base_url, force)
+
+
+def write_export(target_dir, base_url, force):
+    """Render and write the export; the caller holds the export lock"""
+    manifest_path = os.path.join(target_dir, MANIFEST_NAME)
+    previous = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as fh:
+            previous = json.load(fh)
+
+    artifacts = collect_artifacts(base_url)
+    manifest = {path: fingerprint(content) for path, content in artifacts.items()}
+    changed = [
+        path for path in artifacts
+        if force or previous.get(path) != manifest[path] or not os.path.exists(os.path.join(target_dir, path))
+    ]
+    # index.html goes last
+    changed.sort(key=lambda path: path == INDEX_NAME)
+    for path in changed:
+        atomic_write(os.path.join(target_dir, path), artifacts[path])
+
+    for path in set(previous) - set(artifacts):
+        stale = os.path.join(target_dir, path)
+        if os.path.exists(stale):
+            os.unlink(stale)
+
+    atomic_write(manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return len(artifacts), changed
+
+
+# ==================== RE-EXPORT ON PUBLISH ====================
+
+def run_scheduled_export():
+    target_dir = get_export_dir()
+    if not target_dir:
+        return
+    try:
+        export_landing(target_dir, getattr(settings, 'LANDING_EXPORT_BASE_URL', ''))
+    except Exception:
+        # The admin save has already committed; keep the previous export live
+        logger.exception('Landing page re-export failed')
+
+
+def schedule_export():
+    """Re-export after the current transaction commits (unchanged artifacts are skipped)"""
+    if get_export_dir():
+        transaction.on_commit(run_scheduled_export)
@@ -0,0 +1,48 @@
+"""
+Fragment rendering for RoyalERP Landing Page
+Each section partial is cached on the versions of the content it depends on
+"""
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import (
+    fragment_cache_enabled, fragment_cache_key, get_cached_fragments,
+    get_dependency_versions, set_cached_fragments
+)
+
+
+def render_fragments(request, sections, get_context, versions=None):
+    """
+    Return the rendered HTML of each section, in order
+    `get_context` is only called when at least one fragment has to be rendered
+    `versions` overrides the cached dependency versions (the packed snapshot file carries its own)
+    """
+    if not fragment_cache_enabled():
+        context = get_context()
+        return [mark_safe(render_to_string(section.template, context, request)) for section in sections]
+    
+    # Read versions before loading content so an edit made mid-render
+    # leaves the fragment under versions nobody reads any more
+    if versions is None:
+        versions = get_dependency_versions({name for section in sections for name in section.depends_on})
+    keys = {
+        section.key: fragment_cache_key(section.key, {name: versions[name] for name in section.depends_on})
+        for section in sections
+    }
+    cached = get_cached_fragments(list(keys.values()))
+    
+    context = None
+    rendered = {}
+    fragments = []
+    for section in sections:
+        key = keys[section.key]
+        html = cached.get(key)
+        if html is None:
+            if context is None:
+                context = get_context()
+            html = render_to_string(section.template, context, request)
+            rendered[key] = html
+        fragments.append(mark_safe(html))
+    if rendered:
+        set_cached_fragments(rendered)
+    return fragments
@@ -0,0 +1,268 @@
+"""
+SVG icons for RoyalERP Landing Page
+Icon markup is normalized on save (editor metadata, comments and whitespace stripped) and every
+distinct icon is written once into a content-hashed sprite that browsers cache, so cards
+reference it with <use href="sprite.svg#id"> instead of repeating the markup
+"""
+import hashlib
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .assets import save_asset
+from .cache import schedule_dependency_bump
+
+
+# SVG markup fields that get normalized and go into the sprite, per model name
+SVG_FIELDS = {
+    'Feature': ('icon',),
+    'UseCasePoint': ('icon',),
+    'Integration': ('icon_svg',),
+    'StatCounter': ('icon',),
+}
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+
+SPRITE_KIND = 'icons'
+SYMBOL_PREFIX = 'i-'
+
+# Elements that carry editor data rather than drawing
+STRIPPED_ELEMENTS = {'metadata'}
+# Root attributes that size, identify or label the icon where it is used (plus aria-*); the rest
+# move onto the <symbol>
+USE_ATTRIBUTES = {'width', 'height', 'class', 'style', 'id', 'role', 'focusable', 'x', 'y'}
+# Attributes holding id references, scoped along with the ids they point at
+ID_LIST_ATTRIBUTES = {'aria-labelledby', 'aria-describedby'}
+DROPPED_ATTRIBUTES = {'version', 'baseProfile', 'enable-background', 'data-name'}
+
+PROLOG_RE = re.compile(r'<\?xml[^>]*\?>|<!DOCTYPE[^>[]*(\[[^\]]*\])?\s*>', re.I)
+ID_REFERENCE_RE = re.compile(r'url\(\s*#([^)\s]+)\s*\)')
+SYMBOL_RE = re.compile(r'<symbol\b[^>]*\bid="([^"]+)"[^>]*?(?:/>|>.*?</symbol>)', re.S)
+
+
+# ==================== NORMALIZATION ====================
+
+def split_name(name):
+    """('{namespace}local' or 'local') -> (namespace or None, local)"""
+    if name.startswith('{'):
+        namespace, _, local = name[1:].partition('}')
+        return namespace, local
+    return None, name
+
+
+def is_svg(name):
+    return split_name(name)[0] in (None, SVG_NS)
+
+
+def clean_attributes(element):
+    """Attributes in the SVG (or no) namespace, whitespace collapsed; xlink:href becomes href"""
+    attributes = {}
+    for name, value in element.attrib.items():
+        namespace, local = split_name(name)
+        if namespace == XLINK_NS and local == 'href':
+            attributes.setdefault('href', value)
+        elif namespace is None and local not in DROPPED_ATTRIBUTES:
+            attributes[local] = ' '.join(value.split())
+    return attributes
+
+
+def clean(element):
+    """Copy of `element` without editor elements, foreign namespaces and layout whitespace"""
+    copy = ET.Element(split_name(element.tag)[1], clean_attributes(element))
+    copy.text = element.text.strip() if element.text and element.text.strip() else None
+    for child in element:
+        if not isinstance(child.tag, str) or not is_svg(child.tag) or split_name(child.tag)[1] in STRIPPED_ELEMENTS:
+            continue
+        cleaned = clean(child)
+        cleaned.tail = child.tail.strip() if child.tail and child.tail.strip() else None
+        copy.append(cleaned)
+    return copy
+
+
+def serialize(element):
+    attributes = ''.join(f' {name}="{escape(value, {chr(34): "&quot;"})}"' for name, value in element.attrib.items())
+    inner = escape(element.text or '') + ''.join(serialize(child) + escape(child.tail or '') for child in element)
+    if not inner:
+        return f'<{element.tag}{attributes}/>'
+    return f'<{element.tag}{attributes}>{inner}</{element.tag}>'
+
+
+def parse_svg(markup):
+    """Cleaned <svg> element of `markup`, or None when it isn't a single SVG document"""
+    markup = (markup or '').strip()
+    if not markup.startswith(('<svg', '<?xml', '<!')) or '<!ENTITY' in markup:
+        return None
+    try:
+        root = ET.fromstring(PROLOG_RE.sub('', markup))
+    except ET.ParseError:
+        return None
+    if not is_svg(root.tag) or split_name(root.tag)[1] != 'svg':
+        return None
+    return clean(root)
+
+
+def normalize_svg(markup):
+    """Minified markup of an SVG icon; anything that isn't SVG (an icon class, say) is only trimmed"""
+    root = parse_svg(markup)
+    if root is None:
+        return (markup or '').strip()
+    return serialize(root)  # Inlined in HTML, so no xmlns needed
+
+
+def normalize_svg_fields(instance):
+    """Normalize the SVG fields of `instance` in place (called before save)"""
+    for field_name in SVG_FIELDS.get(type(instance).__name__, ()):
+        setattr(instance, field_name, normalize_svg(getattr(instance, field_name)))
+
+
+# ==================== SPRITE ====================
+
+class Icon:
+    """An SVG split into the <symbol> that goes into the sprite and the attributes of the <svg> that uses it"""
+
+    __slots__ = ('symbol_id', 'symbol', 'use_attributes')
+
+    def __init__(self, root):
+        symbol_attributes = {name: value for name, value in root.attrib.items() if not is_use_attribute(name)}
+        self.use_attributes = {name: value for name, value in root.attrib.items() if is_use_attribute(name)}
+        if 'viewBox' in root.attrib:
+            self.use_attributes['viewBox'] = root.attrib['viewBox']  # Keeps the aspect ratio where it is used
+        body = ''.join(serialize(child) + escape(child.tail or '') for child in root)
+        digest = hashlib.sha1(repr((sorted(symbol_attributes.items()), body)).encode()).hexdigest()[:10]
+        self.symbol_id = SYMBOL_PREFIX + digest
+        for name in ID_LIST_ATTRIBUTES & set(self.use_attributes):  # A <title id> now lives in the symbol
+            self.use_attributes[name] = scope_id_list(self.use_attributes[name], self.symbol_id)
+        self.symbol = ET.Element('symbol', {'id': self.symbol_id, **symbol_attributes})
+        for child in root:
+            self.symbol.append(scope_ids(child, self.symbol_id))
+
+    @property
+    def labelled(self):
+        """Whether the icon is announced to screen readers; otherwise it is decorative and hidden"""
+        attributes = self.use_attributes
+        return bool(attributes.get('aria-label') or attributes.get('aria-labelledby') or attributes.get('role') == 'img')
+
+
+def is_use_attribute(name):
+    return name in USE_ATTRIBUTES or name.startswith('aria-')
+
+
+def scope_id_list(value, prefix):
+    return ' '.join(f'{prefix}-{name}' for name in value.split())
+
+
+def scope_ids(element, prefix):
+    """Prefix ids (gradients, clip paths) and references to them so symbols can't collide in the sprite"""
+    copy = ET.Element(element.tag, {})
+    for name, value in element.attrib.items():
+        if name == 'id':
+            value = f'{prefix}-{value}'
+        elif name in ID_LIST_ATTRIBUTES:
+            value = scope_id_list(value, prefix)
+        elif name == 'href' and value.startswith('#'):
+            value = f'#{prefix}-{value[1:]}'
+        else:
+            value = ID_REFERENCE_RE.sub(lambda match: f'url(#{prefix}-{match.group(1)})', value)
+        copy.set(name, value)
+    copy.text, copy.tail = element.text, element.tail
+    for child in element:
+        copy.append(scope_ids(child, prefix))
+    return copy
+
+
+@lru_cache(maxsize=512)
+def get_icon(markup):
+    """Icon for stored markup (None when it isn't SVG); cached as the same icons render on every page"""
+    root = parse_svg(markup)
+    return Icon(root) if root is not None else None
+
+
+def sprite_models():
+    """Models with SVG fields that an enabled section renders"""
+    from .sections import SECTIONS
+
+    rendered = {name.partition(':')[0] for section in SECTIONS if section.enabled for name in section.depends_on}
+    return [model_name for model_name in SVG_FIELDS if model_name in rendered]
+
+
+def icon_sources():
+    """
+    Stored SVG icons of the rendered models; inactive rows too, so toggling a card never
+    rebuilds the sprite (and changes its URL)
+    """
+    from django.apps import apps
+
+    for model_name in sprite_models():
+        model = apps.get_model('landing', model_name)
+        for values in model.objects.values_list(*SVG_FIELDS[model_name]):
+            yield from (value for value in values if value)
+
+
+def build_sprite(icons):
+    symbols = ''.join(serialize(icon.symbol) for icon in sorted(icons, key=lambda icon: icon.symbol_id))
+    return f'<svg xmlns="{SVG_NS}">{symbols}</svg>'
+
+
+@lru_cache(maxsize=8)
+def read_sprite(name):
+    """{symbol id: <symbol> markup} of a sprite file (names are content-hashed, so a name never changes content)"""
+    with default_storage.open(name, 'rb') as fh:
+        return {match.group(1): match.group(0) for match in SYMBOL_RE.finditer(fh.read().decode())}
+
+
+def is_cross_origin(url):
+    return bool(urlsplit(url).netloc)
+
+
+def sprite_inlined(name):
+    """
+    Whether pages carry the sprite instead of linking it: browsers refuse <use href> to a file
+    on another origin, as when media (or the static export) is served from a CDN
+    """
+    from .export import get_export_dir
+
+    export_base_url = getattr(settings, 'LANDING_EXPORT_BASE_URL', '') if get_export_dir() else ''
+    return is_cross_origin(default_storage.url(name)) or is_cross_origin(export_base_url)
+
+
+def inline_sprite(name, symbol_ids):
+    """The symbols in `symbol_ids` as a hidden <svg> to put once in the page"""
+    symbols = read_sprite(name)
+    markup = ''.join(symbols[symbol_id] for symbol_id in sorted(set(symbol_ids)) if symbol_id in symbols)
+    if not markup:
+        return ''
+    # Not display:none, which stops gradients and clip paths inside symbols from rendering
+    return (
+        '<svg width="0" height="0" style="position:absolute;width:0;height:0;overflow:hidden" aria-hidden="true">'
+        f'{markup}</svg>'
+    )
+
+
+def update_icon_sprite(landing_settings):
+    """
+    Rewrite the sprite when the set of distinct icons changed
+    Recorded in LandingPageSettings.generated_assets with a queryset update, then the sections
+    showing icons are re-rendered so they all point at the same sprite
+    Returns True when the sprite changed
+    """
+    icons = {icon.symbol_id: icon for icon in filter(None, map(get_icon, set(icon_sources())))}
+    symbols = sorted(icons)
+    assets = dict(landing_settings.generated_assets or {})
+    current = assets.get(SPRITE_KIND) or {}
+    if current.get('symbols', []) == symbols:
+        return False
+    if symbols:
+        assets[SPRITE_KIND] = {'name': save_asset(SPRITE_KIND, build_sprite(icons.values()), 'svg'), 'symbols': symbols}
+    else:
+        assets.pop(SPRITE_KIND, None)
+    type(landing_settings).objects.filter(pk=landing_settings.pk).update(generated_assets=assets)
+    landing_settings.generated_assets = assets
+    landing_settings.invalidate_cache()
+    schedule_dependency_bump([type(landing_settings).__name__, *SVG_FIELDS])
+    return True
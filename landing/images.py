@@ -0,0 +1,185 @@
+"""
+Responsive image pipeline for RoyalERP Landing Page
+Generates resized WebP + fallback variants of uploaded images for srcset/<picture>
+"""
+import base64
+import hashlib
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.text import slugify
+from PIL import Image, ImageFilter, ImageOps
+
+
+VARIANT_WIDTHS = (96, 192, 320, 480, 640, 960, 1280, 1920)
+VARIANT_DIR = 'landing/variants'
+THUMBNAIL_DIR = 'landing/thumbnails'
+THUMBNAIL_SIZE = 120  # Admin previews are 50-60px, 2x for HiDPI
+VARIANT_QUALITY = 80
+PLACEHOLDER_WIDTH = 16
+# Bump when the stored renditions layout changes so existing rows are rebuilt
+RENDITIONS_SCHEMA = 3
+
+# Image fields that get variants, per model name
+IMAGE_FIELDS = {
+    'LandingPageSettings': ('hero_image', 'logo_image'),
+    'Feature': ('image',),
+    'SectionBlock': ('image',),
+    'Integration': ('icon',),
+    'Testimonial': ('avatar',),
+    'SectionImage': ('image',),
+}
+
+FORMAT_EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+
+# Raised by Pillow/storage for missing, truncated or hostile uploads
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+
+def renditions_field(field_name):
+    """Name of the JSONField storing the variants of `field_name`"""
+    return f'{field_name}_renditions'
+
+
+def encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == 'jpeg':
+        image.convert('RGB').save(buffer, 'JPEG', quality=VARIANT_QUALITY, optimize=True, progressive=True)
+    elif fmt == 'png':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        image.save(buffer, 'WEBP', quality=VARIANT_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def build_placeholder(image):
+    """Tiny blurred JPEG as a data URI, shown while the real image loads"""
+    width, height = image.size
+    small = image.convert('RGB').resize(
+        (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.BILINEAR
+    ).filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    small.save(buffer, 'JPEG', quality=40)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def thumbnail_name(source_name):
+    """Deterministic thumbnail path for an uploaded file (upload names are unique)"""
+    stem = slugify(os.path.splitext(os.path.basename(source_name))[0])[:40] or 'image'
+    digest = hashlib.sha1(source_name.encode()).hexdigest()[:12]
+    return f'{THUMBNAIL_DIR}/{stem}-{digest}-{THUMBNAIL_SIZE}.webp'
+
+
+def save_thumbnail(image, source_name):
+    """Write the admin thumbnail for `image` unless it already exists"""
+    name = thumbnail_name(source_name)
+    if not default_storage.exists(name):
+        thumb = image.copy()
+        thumb.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+        if thumb.mode not in ('RGB', 'RGBA'):
+            thumb = thumb.convert('RGBA')
+        name = default_storage.save(name, ContentFile(encode(thumb, 'webp')))
+    return name
+
+
+def get_thumbnail_url(file, renditions=None):
+    """
+    URL of the small admin thumbnail for `file`
+    Uses the stored renditions when current, otherwise generates it on first use
+    """
+    renditions = renditions or {}
+    if renditions.get('source') == file.name and renditions.get('thumbnail'):
+        return default_storage.url(renditions['thumbnail'])
+    name = thumbnail_name(file.name)
+    if not default_storage.exists(name):
+        try:
+            file.open('rb')
+            try:
+                name = save_thumbnail(ImageOps.exif_transpose(Image.open(file)), file.name)
+            finally:
+                file.close()
+        except IMAGE_ERRORS:
+            return file.url
+    return default_storage.url(name)
+
+
+def build_renditions(file):
+    """
+    Generate variants of an uploaded image in several widths, as WebP and as a fallback format
+    Variant names contain a hash of the source bytes, so they never change once written
+    Also records the intrinsic size, a blurred placeholder (opaque images only)
+    and the admin thumbnail
+    """
+    file.open('rb')
+    try:
+        data = file.read()
+    finally:
+        file.close()
+    image = Image.open(BytesIO(data))
+    if not getattr(image, 'is_animated', False):
+        image = ImageOps.exif_transpose(image)
+    width, height = image.size
+    renditions = {
+        'schema': RENDITIONS_SCHEMA, 'source': file.name,
+        'width': width, 'height': height, 'placeholder': '', 'variants': [],
+        'thumbnail': save_thumbnail(image, file.name),
+    }
+    if getattr(image, 'is_animated', False):
+        return renditions  # Resizing would drop the animation; serve the original
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    fallback = 'png' if image.mode == 'RGBA' else 'jpeg'
+    if image.mode == 'RGB':
+        # A placeholder would stay visible behind transparent pixels
+        renditions['placeholder'] = build_placeholder(image)
+    digest = hashlib.sha1(data).hexdigest()[:12]
+    stem = slugify(os.path.splitext(os.path.basename(file.name))[0])[:40] or 'image'
+
+    widths = sorted({w for w in VARIANT_WIDTHS if w < width} | {min(width, VARIANT_WIDTHS[-1])})
+    for w in widths:
+        resized = image if w == width else image.resize((w, max(1, round(height * w / width))), Image.LANCZOS)
+        for fmt in ('webp', fallback):
+            name = f'{VARIANT_DIR}/{stem}-{digest}-{w}w.{FORMAT_EXTENSIONS[fmt]}'
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(encode(resized, fmt)))
+            renditions['variants'].append({'width': w, 'format': fmt, 'name': name})
+    return renditions
+
+
+def outdated_fields(instance, force=False):
+    """Image fields of `instance` whose stored renditions don't match the current file"""
+    fields = []
+    for field_name in IMAGE_FIELDS.get(type(instance).__name__, ()):
+        file = getattr(instance, field_name)
+        current = getattr(instance, renditions_field(field_name)) or {}
+        if not file:
+            if current:
+                fields.append(field_name)
+        elif force or current.get('source') != file.name or current.get('schema') != RENDITIONS_SCHEMA:
+            fields.append(field_name)
+    return fields
+
+
+def update_renditions(instance, force=False):
+    """
+    Regenerate variants for every image field of `instance` whose file changed
+    Stored with a queryset update so no further save signals fire
+    Returns the list of updated renditions fields; unreadable images raise IMAGE_ERRORS
+    """
+    updates = {}
+    for field_name in outdated_fields(instance, force):
+        file = getattr(instance, field_name)
+        target = renditions_field(field_name)
+        renditions = build_renditions(file) if file else {}
+        if renditions != (getattr(instance, target) or {}):
+            updates[target] = renditions
+    if updates:
+        type(instance).objects.filter(pk=instance.pk).update(**updates)
+        for target, renditions in updates.items():
+            setattr(instance, target, renditions)
+        if hasattr(instance, 'invalidate_cache'):
+            instance.invalidate_cache()  # Singletons are cached by load()
+    return list(updates)
@@ -0,0 +1,40 @@
+"""
+Normalize stored SVG icons and rebuild the icon sprite
+Usage: python manage.py build_icon_sprite
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from landing.cache import bump_dependency_versions
+from landing.icons import SPRITE_KIND, SVG_FIELDS, normalize_svg, update_icon_sprite
+from landing.models import LandingPageSettings
+
+
+class Command(BaseCommand):
+    help = 'Minify the SVG icons saved before normalization and write every distinct icon into one sprite'
+
+    def handle(self, *args, **options):
+        before = after = updated = 0
+        for model_name, field_names in SVG_FIELDS.items():
+            model = apps.get_model('landing', model_name)
+            for pk, *values in model.objects.values_list('pk', *field_names):
+                normalized = [normalize_svg(value) for value in values]
+                before += sum(len(value or '') for value in values)
+                after += sum(len(value) for value in normalized)
+                changes = {name: value for name, value, old in zip(field_names, normalized, values) if value != old}
+                if changes:
+                    # Queryset update: normalizing keeps updated_at and fires no save signals
+                    model.objects.filter(pk=pk).update(**changes)
+                    updated += 1
+        if updated:
+            bump_dependency_versions(list(SVG_FIELDS))
+        self.stdout.write(f'  Normalized {updated} rows: {before} -> {after} bytes of icon markup')
+
+        landing_settings = LandingPageSettings.load(cached=False)
+        rebuilt = update_icon_sprite(landing_settings)
+        sprite = landing_settings.generated_assets.get(SPRITE_KIND)
+        if not sprite:
+            self.stdout.write(self.style.SUCCESS('No SVG icons stored'))
+            return
+        status = 'Rebuilt' if rebuilt else 'Unchanged'
+        self.stdout.write(self.style.SUCCESS(f'{status}: {sprite["name"]} ({len(sprite["symbols"])} icons)'))
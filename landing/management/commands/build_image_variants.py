@@ -0,0 +1,32 @@
+"""
+Generate responsive variants for existing landing page images
+Usage: python manage.py build_image_variants [--force]
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from landing.cache import bump_dependency_versions, content_dependencies
+from landing.images import IMAGE_ERRORS, IMAGE_FIELDS, update_renditions
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/fallback variants for every landing page image field'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild variants even if they are up to date')
+
+    def handle(self, *args, **options):
+        updated = 0
+        for model_name in IMAGE_FIELDS:
+            model = apps.get_model('landing', model_name)
+            for instance in model.objects.all():
+                try:
+                    fields = update_renditions(instance, force=options['force'])
+                except IMAGE_ERRORS as exc:
+                    self.stderr.write(f'  {model_name} #{instance.pk}: {exc}')
+                    continue
+                if fields:
+                    updated += 1
+                    bump_dependency_versions(content_dependencies(instance))
+                    self.stdout.write(f'  {model_name} #{instance.pk}: {", ".join(fields)}')
+        self.stdout.write(self.style.SUCCESS(f'Updated variants for {updated} rows'))
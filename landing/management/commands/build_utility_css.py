@@ -0,0 +1,29 @@
+"""
+Compile the utility classes used by the templates into a static stylesheet
+Usage: python manage.py build_utility_css [--stdout]
+"""
+from django.core.management.base import BaseCommand
+
+from landing.assets import update_generated_assets
+from landing.models import LandingPageSettings
+from landing.utility_css import build_utility_css, get_theme_colors, scan_candidates, candidates_digest
+
+
+class Command(BaseCommand):
+    help = 'Scan templates for utility classes and write a minified stylesheet with the theme colours baked in'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stdout', action='store_true', help='Print the stylesheet instead of storing it')
+
+    def handle(self, *args, **options):
+        # Templates may have changed since this process first scanned them
+        scan_candidates.cache_clear()
+        candidates_digest.cache_clear()
+        landing_settings = LandingPageSettings.load(cached=False)
+        if options['stdout']:
+            self.stdout.write(build_utility_css(get_theme_colors(landing_settings)))
+            return
+        updated = update_generated_assets(landing_settings, force=True)
+        asset = landing_settings.generated_assets['utilities']
+        status = 'Rebuilt' if 'utilities' in updated else 'Unchanged'
+        self.stdout.write(self.style.SUCCESS(f'{status}: {asset["name"]}'))
@@ -0,0 +1,134 @@
+"""
+Check the queries behind the landing page
+Usage: python manage.py explain_landing [-v 2]
+
+Fails when a landing query does a full scan or a temp B-tree sort, when a partial reads a
+field its loader didn't fetch, or when an admin change list lazily loads a deferred field
+"""
+import re
+
+from django.contrib import admin
+from django.contrib.admin.templatetags.admin_list import results
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from landing.admin import ProjectedListAdmin
+from landing.database import QueryRecorder
+from landing.models import LandingPageSettings
+from landing.records import track_missing_fields
+from landing.sections import SECTIONS, load_section_context
+
+
+TABLE_RE = re.compile(r'\bFROM\s+"?(\w+)"?', re.I)
+SCAN_INDEX_RE = re.compile(r'^SCAN \S+ USING (?:COVERING )?INDEX (\S+)')
+
+
+def partial_indexes(cursor):
+    """Names of the partial indexes in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    names = set()
+    for (table,) in cursor.fetchall():
+        cursor.execute(f'PRAGMA index_list("{table}")')
+        names |= {row[1] for row in cursor.fetchall() if row[4]}
+    return names
+
+
+def plan_problems(plan, partial):
+    """
+    Plan steps that read a whole table or sort rows in a temporary B-tree
+    Scanning a partial index is fine: it only holds the active rows
+    """
+    problems = []
+    for detail in plan:
+        if 'TEMP B-TREE' in detail:
+            problems.append(detail)
+        elif detail.startswith('SCAN ') and detail != 'SCAN CONSTANT ROW':
+            index = SCAN_INDEX_RE.match(detail)
+            if not index or index.group(1) not in partial:
+                problems.append(detail)
+    return problems
+
+
+def table_label(sql):
+    table = TABLE_RE.search(sql)
+    return table.group(1) if table else sql[:60]
+
+
+class Command(BaseCommand):
+    help = 'Check landing query plans and that rendering only reads the fields that were loaded'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('explain_landing reads SQLite query plans; the default database is ' + connection.vendor)
+        self.verbose = options['verbosity'] > 1
+
+        # Every section, disabled ones included, so switching one on can't bring a slow query
+        landing_settings = LandingPageSettings.load()
+        loader_queries = QueryRecorder()
+        with connection.execute_wrapper(loader_queries):
+            context = load_section_context(SECTIONS)
+
+        failures = self.check_plans(loader_queries.queries)
+        failures += self.check_partials(context, landing_settings)
+        failures += self.check_changelists()
+        if failures:
+            raise CommandError(f'{failures} landing query problems')
+        self.stdout.write(self.style.SUCCESS('Every landing query is served by an index and every rendered field is loaded'))
+
+    def report(self, label, problems, details=()):
+        style = self.style.ERROR if problems else self.style.SUCCESS
+        self.stdout.write(style(f'  {"FAIL" if problems else "ok":<5}{label}'))
+        for detail in details if (problems or self.verbose) else ():
+            self.stdout.write(f'        {detail}')
+        return bool(problems)
+
+    def check_plans(self, queries):
+        self.stdout.write('Query plans:')
+        with connection.cursor() as cursor:
+            partial = partial_indexes(cursor)
+        failures = 0
+        for sql, params in queries:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            details = ([sql] if self.verbose else []) + plan
+            failures += self.report(table_label(sql), plan_problems(plan, partial), details)
+        return failures
+
+    def check_partials(self, context, landing_settings):
+        """
+        Rendering the loaded records must not query, nor read a field missing from RENDERED_FIELDS
+        (templates would silently render it empty)
+        """
+        self.stdout.write('Partials (rows currently in the database):')
+        request = RequestFactory().get('/')
+        failures = 0
+        for section in SECTIONS:
+            lazy = QueryRecorder()
+            with connection.execute_wrapper(lazy), track_missing_fields() as missing:
+                render_to_string(section.template, {**context, 'settings': landing_settings}, request)
+            problems = [sql for sql, _ in lazy.queries] + [f'{record}.{name} not loaded' for record, name in sorted(missing)]
+            failures += self.report(section.template, problems, problems)
+        return failures
+
+    def check_changelists(self):
+        """Change list rows must be built from the `list_only` fields alone"""
+        self.stdout.write('Admin change lists (rows currently in the database):')
+        request = RequestFactory().get('/')
+        request.user = get_user_model()(is_active=True, is_staff=True, is_superuser=True)
+        failures = 0
+        for model, model_admin in admin.site._registry.items():
+            if not isinstance(model_admin, ProjectedListAdmin):
+                continue
+            changelist = model_admin.get_changelist_instance(request)
+            changelist.formset = None  # Editable columns render as plain values
+            list(changelist.result_list)
+            lazy = QueryRecorder()
+            with connection.execute_wrapper(lazy):
+                for row in results(changelist):
+                    list(row)
+            failures += self.report(model._meta.label, lazy.queries, [sql for sql, _ in lazy.queries])
+        return failures
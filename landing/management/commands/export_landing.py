@@ -0,0 +1,36 @@
+"""
+Export the landing page as static files
+Usage: python manage.py export_landing [--output DIR] [--base-url URL] [--force]
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from landing.export import ExportError, export_landing
+
+
+class Command(BaseCommand):
+    help = 'Render the landing page with its static and media files into a directory for nginx/CDN serving'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=getattr(settings, 'LANDING_EXPORT_DIR', None),
+            help='Target directory (defaults to LANDING_EXPORT_DIR)',
+        )
+        parser.add_argument(
+            '--base-url', default=getattr(settings, 'LANDING_EXPORT_BASE_URL', ''),
+            help='CDN URL to prefix asset paths with (defaults to relative paths)',
+        )
+        parser.add_argument('--force', action='store_true', help='Rewrite every artifact, even unchanged ones')
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError('No output directory: pass --output or set LANDING_EXPORT_DIR')
+        try:
+            total, changed = export_landing(options['output'], options['base_url'], options['force'])
+        except ExportError as exc:
+            raise CommandError(str(exc))
+        for path in changed:
+            self.stdout.write(f'  {path}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {total} artifacts to {options["output"]} ({len(changed)} written)'
+        ))
@@ -0,0 +1,19 @@
+"""
+Run queued media jobs in the foreground
+Usage: python manage.py process_media_jobs
+"""
+from django.core.management.base import BaseCommand
+
+from landing.models import MediaJob
+from landing.tasks import pending_job_ids, run_job
+
+
+class Command(BaseCommand):
+    help = 'Process pending landing media jobs (variants, metadata) without the web process'
+
+    def handle(self, *args, **options):
+        job_ids = pending_job_ids()
+        for job_id in job_ids:
+            run_job(job_id)
+        failed = MediaJob.objects.filter(pk__in=job_ids, status='FAILED').count()
+        self.stdout.write(self.style.SUCCESS(f'Processed {len(job_ids)} jobs ({failed} failed)'))
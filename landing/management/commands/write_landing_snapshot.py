@@ -0,0 +1,31 @@
+"""
+Write the packed content snapshot the landing view renders from
+Usage: python manage.py write_landing_snapshot [--output FILE]
+
+Run it on every deploy, after collectstatic: the version covers the templates and the static
+files manifest, and workers ignore a file written with other ones (they read the database)
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from landing.packed import write_snapshot_file
+
+
+class Command(BaseCommand):
+    help = 'Pack every active row the landing page renders into one versioned JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=getattr(settings, 'LANDING_SNAPSHOT_FILE', None),
+            help='Snapshot file (defaults to LANDING_SNAPSHOT_FILE)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError('No snapshot file: pass --output or set LANDING_SNAPSHOT_FILE')
+        version = write_snapshot_file(options['output'])
+        size = os.path.getsize(options['output'])
+        status = f'Wrote version {version}' if version else 'Unchanged'
+        self.stdout.write(self.style.SUCCESS(f'{status}: {options["output"]} ({size:,} bytes)'))
@@ -0,0 +1,214 @@
+"""
+Production file serving for RoyalERP Landing Page
+Serves MEDIA_ROOT and STATIC_ROOT with HTTP Range support, conditional requests, far-future
+caching for content-addressed files, precompressed .br/.gz siblings for static assets and
+optional X-Accel-Redirect / X-Sendfile offload to the proxy
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .storage import is_hashed_name
+
+
+# Not registered by default on every platform
+for content_type, extension in (('image/webp', '.webp'), ('video/webm', '.webm'), ('video/mp4', '.mp4'),
+                                ('video/ogg', '.ogv'), ('image/svg+xml', '.svg')):
+    mimetypes.add_type(content_type, extension)
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+DEFAULT_MAX_AGE = 60 * 60
+# Files under these prefixes have content hashes in their names and never change
+DEFAULT_IMMUTABLE_PREFIXES = ('landing/variants/', 'landing/thumbnails/', 'landing/generated/')
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Preferred first
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) inclusive for a single-range header, None to serve the whole file
+    Raises ValueError when the range can't be satisfied
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # Multiple or malformed ranges: a full 200 response is allowed
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    """A Range request only applies if If-Range (when sent) still matches the file"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts (q=0 means refused)"""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.lower())
+    return accepted
+
+
+def negotiate_precompressed(request, path):
+    """Pick a precompressed sibling of `path` the client accepts: (path to send, coding or None)"""
+    accepted = accepted_encodings(request)
+    for coding, suffix in PRECOMPRESSED_ENCODINGS:
+        if (coding in accepted or '*' in accepted) and os.path.isfile(path + suffix):
+            return path + suffix, coding
+    return path, None
+
+
+def offload_response(path, relative_path):
+    """Let the front proxy send the file (it also handles Range requests)"""
+    offload = getattr(settings, 'LANDING_MEDIA_OFFLOAD', None)
+    if offload == 'x-accel-redirect':
+        response = HttpResponse()
+        prefix = getattr(settings, 'LANDING_MEDIA_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(relative_path)
+        return response
+    if offload == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = path
+        return response
+    return None
+
+
+def serve_file(request, path, relative_path, immutable=False, precompressed=False, offload=True):
+    """
+    Serve one file from disk with validators, caching and Range support
+    With `precompressed`, a .br/.gz sibling is sent instead when the client accepts it
+    `offload` lets LANDING_MEDIA_OFFLOAD hand the transfer to the proxy
+    """
+    if not os.path.isfile(path):
+        raise Http404('File not found')
+    content_type, encoding = mimetypes.guess_type(path)
+    content_type = content_type or 'application/octet-stream'
+    filename = os.path.basename(path)  # Content-Disposition names the file asked for, not its .br/.gz sibling
+    if precompressed:
+        original = path
+        path, coding = negotiate_precompressed(request, path)
+        if coding:
+            encoding = coding
+            relative_path += path[len(original):]
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise Http404('File not found')
+
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}{"-" + encoding if encoding else ""}"'
+
+    def finalize(response):
+        response['Content-Type'] = content_type
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Accept-Ranges'] = 'bytes'
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if precompressed:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if immutable:
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=getattr(settings, 'LANDING_MEDIA_MAX_AGE', DEFAULT_MAX_AGE))
+        return response
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:
+        return finalize(conditional)
+
+    offloaded = offload_response(path, relative_path) if offload else None
+    if offloaded is not None:
+        return finalize(offloaded)
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return finalize(response)
+
+    if byte_range is None:
+        return finalize(FileResponse(open(path, 'rb'), filename=filename))
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(read_range(path, start, length), status=206)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    return finalize(response)
+
+
+def is_immutable_media(relative_path):
+    prefixes = getattr(settings, 'LANDING_IMMUTABLE_MEDIA_PREFIXES', DEFAULT_IMMUTABLE_PREFIXES)
+    return relative_path.startswith(tuple(prefixes))
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve an uploaded file from MEDIA_ROOT"""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    return serve_file(request, full_path, path, immutable=is_immutable_media(path))
+
+
+@require_safe
+def serve_static(request, path):
+    """
+    Serve a collected static file from STATIC_ROOT
+    Hashed names (CompressedManifestStaticFilesStorage) are immutable and sent precompressed
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    return serve_file(request, full_path, path, immutable=is_hashed_name(path), precompressed=True, offload=False)
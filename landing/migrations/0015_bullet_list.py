@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:13
+
+from django.db import migrations, models
+
+
+BULLET_MODELS = ("sectionblock", "integration", "pricingplan")
+
+
+def backfill_bullet_list(apps, schema_editor):
+    for model_name in BULLET_MODELS:
+        model = apps.get_model("landing", model_name)
+        rows = list(model.objects.all())
+        for row in rows:
+            text = (row.bullets or "").strip()
+            row.bullet_list = [b.strip() for b in text.split("\n") if b.strip()]
+        model.objects.bulk_update(rows, ["bullet_list"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("landing", "0014_alter_footerlink_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="integration",
+            name="bullet_list",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Parsed from bullets on save",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pricingplan",
+            name="bullet_list",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Parsed from bullets on save",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sectionblock",
+            name="bullet_list",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Parsed from bullets on save",
+            ),
+        ),
+        migrations.RunPython(backfill_bullet_list, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("landing", "0016_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feature",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="integration",
+            name="icon_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="landingpagesettings",
+            name="hero_image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="landingpagesettings",
+            name="logo_image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sectionblock",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sectionimage",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+        migrations.AddField(
+            model_name="testimonial",
+            name="avatar_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized variants, generated on upload",
+            ),
+        ),
+    ]
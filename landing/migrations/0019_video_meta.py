@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("landing", "0018_mediajob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sectionblock",
+            name="video_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="MIME type, size and duration, probed on upload",
+            ),
+        ),
+    ]
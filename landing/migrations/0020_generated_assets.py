@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("landing", "0019_video_meta"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="landingpagesettings",
+            name="generated_assets",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Stylesheets generated from the theme colours",
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("landing", "0020_generated_assets"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="faq",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_faq_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feature",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_feature_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="footerlink",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["column_name", "order"],
+                name="landing_footerlink_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="integration",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_integration_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pricingplan",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_pricingplan_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectionblock",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_sectionblock_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sectionimage",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["section", "order"],
+                name="landing_sectionimage_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="statcounter",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_statcounter_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="testimonial",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_testimonial_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usecasepoint",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["order"],
+                name="landing_usecasepoint_active",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("landing", "0021_content_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediajob",
+            name="worker",
+            field=models.CharField(
+                blank=True,
+                help_text="host:pid:boot id of the process running it",
+                max_length=100,
+            ),
+        ),
+    ]
@@ -2,29 +2,125 @@
 Django models for RoyalERP Chatbot Landing Page
 All content is admin-driven with ordering and active toggles
 """
-from django.db import models
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.cache import cache
 
 
-class SingletonModel(models.Model):
+class ContentModel(models.Model):
+    """Base class for admin-driven content, tracks when each row last changed"""
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+
+
+def content_models():
+    """All admin-driven content models (excludes bookkeeping models such as MediaJob)"""
+    return [model for model in apps.get_app_config('landing').get_models() if issubclass(model, ContentModel)]
+
+
+class SingletonModel(ContentModel):
     """Base class for singleton models"""
     
+    # Process-local copies, used only when the shared cache is unreachable
+    _local_cache = {}
+    
     class Meta:
         abstract = True
     
     def save(self, *args, **kwargs):
         self.pk = 1
         super().save(*args, **kwargs)
-        cache.delete(self.__class__.__name__)
+        self.invalidate_cache()
     
     def delete(self, *args, **kwargs):
         pass  # Prevent deletion
     
     @classmethod
-    def load(cls):
-        obj, created = cls.objects.get_or_create(pk=1)
+    def load(cls, cached=True):
+        """
+        Return the singleton, reading through the shared cache
+        Pass cached=False before writing anything derived from it (snapshot file, sprite, assets)
+        """
+        key = cls.__name__
+        obj = None
+        if cached:
+            try:
+                obj = cache.get(key)
+            except Exception:
+                obj = cls._local_cache.get(key)
+        if obj is None:
+            obj = cls._get_or_create_singleton()
+            cls._local_cache[key] = obj
+            try:
+                # Bounded, so a copy that missed an invalidation can't be served indefinitely
+                cache.set(key, obj, getattr(settings, 'LANDING_SINGLETON_CACHE_TIMEOUT', 300))
+            except Exception:
+                pass  # Keep serving from the process-local copy
         return obj
+    
+    @classmethod
+    def _get_or_create_singleton(cls):
+        """Read the row, creating it only if it doesn't exist yet"""
+        obj = cls.objects.filter(pk=1).first()
+        if obj is not None:
+            return obj
+        try:
+            with transaction.atomic():
+                return cls.objects.create(pk=1)
+        except IntegrityError:
+            # Another worker created it first
+            return cls.objects.get(pk=1)
+    
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop cached copies; call after writing the row without save()"""
+        key = cls.__name__
+        cls._local_cache.pop(key, None)
+        cls._cache_delete(key)
+        # Delete again after commit so a concurrent load() can't re-cache the old row
+        transaction.on_commit(lambda: cls._cache_delete(key))
+    
+    @staticmethod
+    def _cache_delete(key):
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
+
+
+def parse_bullets(text):
+    """Split a one-per-line bullets field into a list of stripped items"""
+    if not text:
+        return []
+    return [b.strip() for b in text.strip().split('\n') if b.strip()]
+
+
+class BulletListModel(ContentModel):
+    """
+    Base class for models with a one-per-line `bullets` field
+    The parsed list is stored in `bullet_list` on save so rendering never parses text
+    """
+    
+    bullet_list = models.JSONField(default=list, blank=True, editable=False, help_text="Parsed from bullets on save")
+    
+    class Meta:
+        abstract = True
+    
+    def save(self, *args, **kwargs):
+        self.bullet_list = parse_bullets(self.bullets)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'bullets' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'bullet_list'}
+        super().save(*args, **kwargs)
+    
+    def get_bullets_list(self):
+        """Return bullets as a list"""
+        return list(self.bullet_list)
 
 
 class LandingPageSettings(SingletonModel):
@@ -33,12 +129,14 @@ class LandingPageSettings(SingletonModel):
     # Branding
     site_name = models.CharField(max_length=100, default="RoyalERP Chatbot")
     logo_image = models.ImageField(upload_to='landing/logo/', blank=True, null=True)
+    logo_image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     favicon = models.ImageField(upload_to='landing/favicon/', blank=True, null=True)
     
     # Colors (hex)
     primary_color = models.CharField(max_length=7, default="#1e3a5f", help_text="Deep navy/indigo")
     secondary_color = models.CharField(max_length=7, default="#6366f1", help_text="Indigo/purple")
     accent_color = models.CharField(max_length=7, default="#ec4899", help_text="Pink/lavender")
+    generated_assets = models.JSONField(default=dict, blank=True, editable=False, help_text="Stylesheets generated from the theme colours")
     
     # Hero Section
     hero_title = models.CharField(max_length=200, default="Run your ERP with an AI Chatbot")
@@ -46,6 +144,7 @@ class LandingPageSettings(SingletonModel):
         default="Automate inventory, accounts, sales insights, and reporting with intelligent AI assistance."
     )
     hero_image = models.ImageField(upload_to='landing/hero/', blank=True, null=True, help_text="Dashboard mockup")
+    hero_image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     hero_tagline = models.CharField(
         max_length=200, 
         default="Automate your conversations and boost your marketing strategy",
@@ -116,7 +215,7 @@ class LandingPageSettings(SingletonModel):
         return "Landing Page Settings"
 
 
-class Feature(models.Model):
+class Feature(ContentModel):
     """Feature cards for the features section"""
     
     title = models.CharField(max_length=100)
@@ -131,11 +230,13 @@ class Feature(models.Model):
         null=True,
         help_text="Feature image - will be displayed in the card with 3D effect"
     )
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_feature_active')]
         verbose_name = "Feature"
         verbose_name_plural = "Features"
     
@@ -143,7 +244,7 @@ class Feature(models.Model):
         return self.title
 
 
-class SectionBlock(models.Model):
+class SectionBlock(BulletListModel):
     """Flexible split sections (image + content)"""
     
     LAYOUT_CHOICES = [
@@ -171,7 +272,9 @@ class SectionBlock(models.Model):
     # Media - Image or Video
     media_type = models.CharField(max_length=10, choices=MEDIA_TYPE_CHOICES, default='IMAGE', help_text="Choose Image or Video")
     image = models.ImageField(upload_to='landing/sections/', blank=True, null=True)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     video = models.FileField(upload_to='landing/videos/', blank=True, null=True, help_text="Upload MP4, WebM or OGG video")
+    video_meta = models.JSONField(default=dict, blank=True, editable=False, help_text="MIME type, size and duration, probed on upload")
     video_poster = models.ImageField(upload_to='landing/videos/posters/', blank=True, null=True, help_text="Thumbnail shown before video plays")
     video_autoplay = models.BooleanField(default=True, help_text="Auto-play video (muted)")
     video_loop = models.BooleanField(default=True, help_text="Loop video continuously")
@@ -187,20 +290,15 @@ class SectionBlock(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_sectionblock_active')]
         verbose_name = "Section Block"
         verbose_name_plural = "Section Blocks"
     
     def __str__(self):
         return self.title
-    
-    def get_bullets_list(self):
-        """Return bullets as a list"""
-        if not self.bullets:
-            return []
-        return [b.strip() for b in self.bullets.strip().split('\n') if b.strip()]
 
 
-class UseCasePoint(models.Model):
+class UseCasePoint(ContentModel):
     """Use case accordion items"""
     
     title = models.CharField(max_length=200)
@@ -215,6 +313,7 @@ class UseCasePoint(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_usecasepoint_active')]
         verbose_name = "Use Case"
         verbose_name_plural = "Use Cases"
     
@@ -222,7 +321,7 @@ class UseCasePoint(models.Model):
         return self.title
 
 
-class Integration(models.Model):
+class Integration(BulletListModel):
     """Integration cards - WhatsApp, Database, etc."""
     
     CARD_COLOR_CHOICES = [
@@ -237,6 +336,7 @@ class Integration(models.Model):
     name = models.CharField(max_length=100, help_text="e.g., WhatsApp Integration, Database Connection")
     description = models.TextField(blank=True, help_text="Short description of this integration")
     icon = models.ImageField(upload_to='landing/integrations/', blank=True, null=True)
+    icon_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     icon_svg = models.TextField(blank=True, help_text="SVG code for icon (recommended)")
     icon_color = models.CharField(max_length=20, choices=CARD_COLOR_CHOICES, default='indigo', help_text="Background color for icon")
     bullets = models.TextField(blank=True, help_text="Features list - one per line")
@@ -247,20 +347,15 @@ class Integration(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_integration_active')]
         verbose_name = "Integration"
         verbose_name_plural = "Integrations"
     
     def __str__(self):
         return self.name
-    
-    def get_bullets_list(self):
-        """Return bullets as a list"""
-        if not self.bullets:
-            return []
-        return [b.strip() for b in self.bullets.strip().split('\n') if b.strip()]
 
 
-class PricingPlan(models.Model):
+class PricingPlan(BulletListModel):
     """Pricing plan cards"""
     
     name = models.CharField(max_length=100)
@@ -275,26 +370,22 @@ class PricingPlan(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_pricingplan_active')]
         verbose_name = "Pricing Plan"
         verbose_name_plural = "Pricing Plans"
     
     def __str__(self):
         return self.name
-    
-    def get_bullets_list(self):
-        """Return bullets as a list"""
-        if not self.bullets:
-            return []
-        return [b.strip() for b in self.bullets.strip().split('\n') if b.strip()]
 
 
-class Testimonial(models.Model):
+class Testimonial(ContentModel):
     """Customer testimonials"""
     
     name = models.CharField(max_length=100)
     role = models.CharField(max_length=100)
     company = models.CharField(max_length=100)
     avatar = models.ImageField(upload_to='landing/testimonials/', blank=True, null=True)
+    avatar_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     rating = models.PositiveIntegerField(
         default=5,
         validators=[MinValueValidator(1), MaxValueValidator(5)]
@@ -305,6 +396,7 @@ class Testimonial(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_testimonial_active')]
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
     
@@ -312,7 +404,7 @@ class Testimonial(models.Model):
         return f"{self.name} - {self.company}"
 
 
-class StatCounter(models.Model):
+class StatCounter(ContentModel):
     """Stats strip counters"""
     
     label = models.CharField(max_length=100)
@@ -323,6 +415,7 @@ class StatCounter(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_statcounter_active')]
         verbose_name = "Stat Counter"
         verbose_name_plural = "Stat Counters"
     
@@ -330,7 +423,7 @@ class StatCounter(models.Model):
         return f"{self.label}: {self.value}"
 
 
-class FAQ(models.Model):
+class FAQ(ContentModel):
     """FAQ accordion items"""
     
     question = models.CharField(max_length=300)
@@ -340,6 +433,7 @@ class FAQ(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], condition=models.Q(is_active=True), name='landing_faq_active')]
         verbose_name = "FAQ"
         verbose_name_plural = "FAQs"
     
@@ -347,7 +441,7 @@ class FAQ(models.Model):
         return self.question
 
 
-class FooterLink(models.Model):
+class FooterLink(ContentModel):
     """Footer navigation links organized by column"""
     
     column_name = models.CharField(max_length=50, help_text="Column header (e.g., 'Product', 'Company')")
@@ -358,6 +452,7 @@ class FooterLink(models.Model):
     
     class Meta:
         ordering = ['column_name', 'order']
+        indexes = [models.Index(fields=['column_name', 'order'], condition=models.Q(is_active=True), name='landing_footerlink_active')]
         verbose_name = "Footer Link"
         verbose_name_plural = "Footer Links"
     
@@ -365,7 +460,7 @@ class FooterLink(models.Model):
         return f"{self.column_name} - {self.label}"
 
 
-class SectionImage(models.Model):
+class SectionImage(ContentModel):
     """
     Images/Avatars that can be added to any section
     User can upload multiple images per section with subtitles
@@ -395,6 +490,7 @@ class SectionImage(models.Model):
     section = models.CharField(max_length=50, choices=SECTION_CHOICES, help_text="Which section to display this image")
     image_type = models.CharField(max_length=20, choices=IMAGE_TYPE_CHOICES, default='avatar')
     image = models.ImageField(upload_to='landing/section_images/')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized variants, generated on upload")
     subtitle = models.CharField(max_length=200, blank=True, help_text="One line subtitle/caption")
     alt_text = models.CharField(max_length=200, blank=True, help_text="Alt text for accessibility")
     link_url = models.URLField(blank=True, help_text="Optional link when image is clicked")
@@ -403,8 +499,42 @@ class SectionImage(models.Model):
     
     class Meta:
         ordering = ['section', 'order']
+        indexes = [models.Index(fields=['section', 'order'], condition=models.Q(is_active=True), name='landing_sectionimage_active')]
         verbose_name = "Section Image"
         verbose_name_plural = "Section Images"
     
     def __str__(self):
         return f"{self.get_section_display()} - {self.subtitle or 'Image'}"
+
+
+class MediaJob(models.Model):
+    """
+    Persistent queue entry for background media processing
+    Pending jobs are picked up again after a restart
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=50, help_text="Task name, e.g. 'image_renditions'")
+    model_name = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, help_text="host:pid:boot id of the process running it")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+        verbose_name = "Media Job"
+        verbose_name_plural = "Media Jobs"
+    
+    def __str__(self):
+        return f"{self.kind} {self.model_name} #{self.object_id} ({self.get_status_display()})"
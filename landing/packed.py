@@ -0,0 +1,228 @@
+"""
+Packed content snapshot file for RoyalERP Landing Page
+Publishing writes every active row the page renders into one versioned JSON file; web
+workers load it, reload it only when it changes, and render the page without opening a
+database connection
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .assets import update_generated_assets
+from .cache import code_fingerprint
+from .export import atomic_write
+from .icons import SPRITE_KIND, SVG_FIELDS
+from .models import LandingPageSettings
+from .records import Record, StoredFile, record_type
+from .sections import RENDERED_FIELDS, active, get_active_sections, load_section_context
+from .snapshot import ContentSnapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent publishes are not serialized
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout changes; files in another format are ignored (the view reads the DB)
+PACKED_FORMAT = 1
+
+
+class PackedSnapshotError(ValueError):
+    pass
+
+
+def get_snapshot_path():
+    return getattr(settings, 'LANDING_SNAPSHOT_FILE', None)
+
+
+# ==================== ENCODING ====================
+
+def pack(value, record_fields):
+    """JSON-ready copy of loader output; records become {'$r': model, 'v': [values]}"""
+    if isinstance(value, Record):
+        record_fields[value.model_name] = value.__slots__
+        return {'$r': value.model_name, 'v': [pack(getattr(value, name), record_fields) for name in value.__slots__]}
+    if isinstance(value, StoredFile):
+        return {'$f': value.name}
+    if isinstance(value, dict):
+        return {key: pack(item, record_fields) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [pack(item, record_fields) for item in value]
+    return value
+
+
+def unpack(value, record_types):
+    if isinstance(value, dict):
+        if '$r' in value:
+            return record_types[value['$r']](*(unpack(item, record_types) for item in value['v']))
+        if '$f' in value:
+            return StoredFile(value['$f'])  # URL from this process's storage settings
+        return {key: unpack(item, record_types) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unpack(item, record_types) for item in value]
+    return value
+
+
+def pack_context(context, record_fields):
+    """Pack the loader output; aliases (plans / pricing_plans...) are stored once"""
+    packed, aliases, seen = {}, {}, {}
+    for key, value in context.items():
+        if id(value) in seen:
+            aliases[key] = seen[id(value)]
+        else:
+            seen[id(value)] = key
+            packed[key] = pack(value, record_fields)
+    return packed, aliases
+
+
+def dependency_digest(name, landing_settings, settings_data):
+    """Hash of the rendered content (and the code rendering it) behind one fragment dependency (see Section.depends_on)"""
+    model_name, _, section = name.partition(':')
+    if model_name == LandingPageSettings.__name__:
+        content = settings_data
+    else:
+        queryset = active(apps.get_model('landing', model_name))
+        if section:
+            queryset = queryset.filter(section=section)
+        content = list(queryset.order_by('pk').values_list('pk', *RENDERED_FIELDS[model_name]))
+        if model_name in SVG_FIELDS:
+            content.append((landing_settings.generated_assets or {}).get(SPRITE_KIND))  # Cards link the sprite
+    content = [code_fingerprint(), content]
+    return hashlib.sha1(json.dumps(content, cls=DjangoJSONEncoder, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def build_payload():
+    """Everything the landing view reads, as a JSON-ready dict (without version and timestamp)"""
+    landing_settings = LandingPageSettings.load(cached=False)  # The file must carry the latest row
+    update_generated_assets(landing_settings)
+    settings_data = serializers.serialize('python', [landing_settings])
+    page_sections = get_active_sections()
+    record_fields = {}
+    data, aliases = pack_context(load_section_context(page_sections), record_fields)
+    names = sorted({name for section in page_sections for name in section.depends_on})
+    return {
+        'format': PACKED_FORMAT,
+        'code': code_fingerprint(),
+        'settings': settings_data,
+        'records': record_fields,
+        'data': data,
+        'aliases': aliases,
+        'dependencies': {name: dependency_digest(name, landing_settings, settings_data) for name in names},
+    }
+
+
+# ==================== WRITING ====================
+
+def read_version(path):
+    try:
+        with open(path, 'rb') as fh:
+            return json.load(fh).get('version')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def write_snapshot_file(path=None):
+    """
+    Write the packed snapshot unless its content is unchanged
+    Concurrent publishes are serialized with a lock file so the last writer reads the latest rows
+    Returns the version written, or None when the file was already current
+    """
+    path = path or get_snapshot_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + '.lock', 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        payload = build_payload()
+        body = json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':'), sort_keys=True)
+        version = hashlib.sha1(body.encode()).hexdigest()[:16]
+        if read_version(path) == version:
+            return None
+        payload.update(version=version, written_at=time.time())
+        atomic_write(path, json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode())
+    return version
+
+
+def run_scheduled_snapshot_write():
+    try:
+        write_snapshot_file()
+    except Exception:
+        # The admin save has already committed; workers keep serving the previous file
+        logger.exception('Writing the landing snapshot file failed')
+
+
+def schedule_snapshot_write():
+    """Rewrite the snapshot file after the current transaction commits"""
+    if get_snapshot_path():
+        transaction.on_commit(run_scheduled_snapshot_write)
+
+
+# ==================== READING ====================
+
+class PackedSnapshot:
+    """A loaded snapshot file: the content snapshot plus the version and fragment keys it was written with"""
+
+    __slots__ = ('version', 'last_modified', 'dependencies', 'settings', 'snapshot')
+
+    def __init__(self, payload):
+        if payload.get('format') != PACKED_FORMAT:
+            raise PackedSnapshotError(f'Unsupported snapshot format {payload.get("format")!r}')
+        if payload.get('code') != code_fingerprint():
+            # Written by another deploy: its version would answer 304 for markup this code no longer renders
+            raise PackedSnapshotError('Snapshot written with other templates or static files; run write_landing_snapshot')
+        record_types = {name: record_type(name, fields[1:]) for name, fields in payload['records'].items()}
+        data = unpack(payload['data'], record_types)
+        for alias, key in payload['aliases'].items():
+            data[alias] = data[key]
+        self.version = payload['version']
+        self.last_modified = datetime.fromtimestamp(int(payload['written_at']), tz=timezone.utc)
+        self.dependencies = payload['dependencies']
+        # Deserializing builds the instance from the stored values; no query is made
+        self.settings = next(serializers.deserialize('python', payload['settings'])).object
+        self.snapshot = ContentSnapshot(self.version, self.settings, get_active_sections(), data)
+
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def get_packed_snapshot():
+    """
+    The snapshot file's content, re-read only when the file changed (one stat() per call)
+    None when no file is configured or it can't be read, so the caller falls back to the database
+    """
+    path = get_snapshot_path()
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    if _loaded.get('key') == key:
+        return _loaded['snapshot']
+    with _load_lock:
+        if _loaded.get('key') != key:
+            try:
+                with open(path, 'rb') as fh:
+                    snapshot = PackedSnapshot(json.load(fh))
+            except PackedSnapshotError as exc:
+                logger.warning('Ignoring the landing snapshot file %s: %s', path, exc)
+                snapshot = None
+            except (OSError, ValueError, KeyError, TypeError, DeserializationError):
+                logger.exception('Could not load the landing snapshot file %s', path)
+                snapshot = None
+            _loaded.update(key=key, snapshot=snapshot)
+    return _loaded['snapshot']
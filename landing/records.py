@@ -0,0 +1,103 @@
+"""
+Rendering records for RoyalERP Landing Page
+Loaders read rows with values_list() into small __slots__ objects that carry only the fields
+the partials render, instead of full model instances (no _state, no field descriptors)
+"""
+from contextlib import contextmanager
+
+from django.core.files.storage import default_storage
+from django.db import models
+
+
+class StoredFile:
+    """An uploaded file's name and URL; stands in for FieldFile in templates and image tags"""
+
+    __slots__ = ('name', 'url')
+
+    def __init__(self, name, url=None):
+        self.name = name
+        self.url = url if url is not None else default_storage.url(name)
+
+    def __str__(self):
+        return self.name
+
+    def __reduce__(self):
+        return StoredFile, (self.name, self.url)
+
+
+# Called with (record, attribute name) when a template reads a field that wasn't loaded
+_missing_listeners = []
+
+
+class Record:
+    """Base for rendering records; subclasses get one slot per loaded field (see record_type)"""
+
+    __slots__ = ()
+    model_name = None
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __getattr__(self, name):
+        # Only reached for attributes without a slot, i.e. fields the loader didn't fetch
+        if not name.startswith('_'):
+            for listener in _missing_listeners:
+                listener(self, name)
+        raise AttributeError(f'{type(self).__name__} has no field {name!r} (not in RENDERED_FIELDS)')
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.pk}>'
+
+    def __reduce__(self):
+        return make_record, (self.model_name, self.__slots__, tuple(getattr(self, name) for name in self.__slots__))
+
+
+_record_types = {}
+
+
+def record_type(model_name, fields):
+    """Record class with a slot for `pk` and each of `fields` (one class per model and field list)"""
+    slots = ('pk', *fields)
+    key = (model_name, slots)
+    if key not in _record_types:
+        _record_types[key] = type(f'{model_name}Record', (Record,), {'__slots__': slots, 'model_name': model_name})
+    return _record_types[key]
+
+
+def make_record(model_name, fields, values):
+    """Unpickle a record"""
+    return record_type(model_name, fields[1:])(*values)
+
+
+def load_records(queryset, fields):
+    """Records of `queryset` with exactly `fields`; file fields become StoredFile (None when empty)"""
+    model = queryset.model
+    cls = record_type(model.__name__, fields)
+    file_columns = [
+        index for index, name in enumerate(fields, start=1)
+        if isinstance(model._meta.get_field(name), models.FileField)
+    ]
+    records = []
+    for row in queryset.values_list('pk', *fields):
+        if file_columns:
+            row = list(row)
+            for index in file_columns:
+                row[index] = StoredFile(row[index]) if row[index] else None
+        records.append(cls(*row))
+    return records
+
+
+@contextmanager
+def track_missing_fields():
+    """Collect (record type name, field) for every unloaded field read while the block runs"""
+    missing = set()
+
+    def listener(record, name):
+        missing.add((type(record).__name__, name))
+
+    _missing_listeners.append(listener)
+    try:
+        yield missing
+    finally:
+        _missing_listeners.remove(listener)
@@ -0,0 +1,168 @@
+"""
+Section registry for RoyalERP Landing Page
+Each section declares its partial template, the data it needs and whether it is shown
+"""
+from collections import defaultdict
+from .models import (
+    Feature, SectionBlock, UseCasePoint, Integration, PricingPlan,
+    Testimonial, StatCounter, FAQ, FooterLink, SectionImage
+)
+from .records import load_records
+
+
+# ==================== DATA LOADERS ====================
+# Each loader receives the active sections and returns context entries.
+# A loader shared by several sections runs once per snapshot build.
+
+# Fields the partials read from each model; the loaders fetch nothing else
+# (a field missing here renders empty, see manage.py explain_landing)
+RENDERED_FIELDS = {
+    'Feature': ('title', 'description', 'icon', 'image', 'image_renditions'),
+    'SectionBlock': (
+        'key', 'title', 'subtitle', 'body', 'bullet_list', 'media_type', 'image', 'image_renditions',
+        'video', 'video_meta', 'video_poster', 'video_autoplay', 'video_loop', 'layout_type',
+        'background_style', 'cta_label', 'cta_url', 'secondary_cta_label', 'secondary_cta_url',
+    ),
+    'UseCasePoint': ('title', 'body'),
+    'Integration': (
+        'name', 'description', 'icon', 'icon_renditions', 'icon_svg', 'icon_color', 'bullet_list',
+        'url', 'is_featured', 'is_active', 'order',  # The partial re-sorts with dictsort:"order"
+    ),
+    'PricingPlan': ('name', 'price', 'period', 'bullet_list', 'is_featured', 'cta_label', 'cta_url'),
+    'Testimonial': ('name', 'role', 'company', 'avatar', 'avatar_renditions', 'rating', 'text'),
+    'StatCounter': ('label', 'value', 'icon'),
+    'FAQ': ('question', 'answer'),
+    'FooterLink': ('column_name', 'label', 'url'),
+    'SectionImage': ('section', 'image', 'image_renditions', 'image_type', 'subtitle', 'alt_text', 'link_url'),
+}
+
+
+def active(model):
+    return model.objects.filter(is_active=True)
+
+
+def records(queryset):
+    """Rows of `queryset` as records holding just the fields the partials render"""
+    return load_records(queryset, RENDERED_FIELDS[queryset.model.__name__])
+
+
+def load_features(sections):
+    return {'features': records(active(Feature).order_by('order'))}
+
+
+def load_section_blocks(sections):
+    blocks = records(active(SectionBlock).order_by('order'))
+    return {
+        'sections': {block.key: block for block in blocks},  # Keyed for template access
+        'sections_list': blocks,
+    }
+
+
+def load_use_cases(sections):
+    return {'use_cases': records(active(UseCasePoint).order_by('order'))}
+
+
+def load_integrations(sections):
+    return {'integrations': records(active(Integration).order_by('order'))}
+
+
+def load_pricing_plans(sections):
+    plans = records(active(PricingPlan).order_by('order'))
+    return {'plans': plans, 'pricing_plans': plans}  # Alias for template compatibility
+
+
+def load_testimonials(sections):
+    testimonials = records(active(Testimonial).order_by('order'))
+    return {'testimonials': testimonials, 'reviews': testimonials}  # Alias for template compatibility
+
+
+def load_stats(sections):
+    return {'stats': records(active(StatCounter).order_by('order'))}
+
+
+def load_faqs(sections):
+    return {'faqs': records(active(FAQ).order_by('order'))}
+
+
+def load_footer_links(sections):
+    """Footer links organized by column"""
+    footer_links = defaultdict(list)
+    for link in records(active(FooterLink).order_by('column_name', 'order')):
+        footer_links[link.column_name].append(link)
+    return {'footer_links': dict(footer_links)}
+
+
+def load_section_images(sections):
+    """Section images organized by section, limited to the sections being rendered"""
+    keys = [section.image_section for section in sections if section.image_section]
+    section_images = defaultdict(list)
+    images = records(active(SectionImage).filter(section__in=keys).order_by('section', 'order'))
+    for img in images:
+        section_images[img.section].append(img)
+    return {'section_images': dict(section_images)}
+
+
+# ==================== REGISTRY ====================
+
+class Section:
+    """
+    A page section: its partial, its data loaders, the content it depends on and an enabled flag
+    `depends_on` names models (or 'SectionImage:<section>') whose changes invalidate the cached fragment
+    """
+
+    def __init__(self, key, template, loaders=(), depends_on=(), image_section=None, enabled=True):
+        self.key = key
+        self.template = template
+        self.loaders = tuple(loaders)
+        self.depends_on = tuple(depends_on)
+        self.image_section = image_section  # SectionImage.section shown in this partial
+        self.enabled = enabled
+        if image_section:
+            self.loaders += (load_section_images,)
+            self.depends_on += (f'SectionImage:{image_section}',)
+
+    def __repr__(self):
+        return f'<Section {self.key}>'
+
+
+SECTIONS = [
+    Section('hero', 'landing/partials/hero.html',
+            depends_on=['LandingPageSettings'], image_section='hero'),
+    Section('features', 'landing/partials/features.html', [load_features],
+            depends_on=['Feature'], image_section='features'),
+    Section('automation', 'landing/partials/section_split.html', [load_section_blocks],
+            depends_on=['SectionBlock', 'LandingPageSettings']),
+    Section('use_cases', 'landing/partials/use_cases.html', [load_use_cases, load_section_blocks],
+            depends_on=['UseCasePoint', 'SectionBlock'], enabled=False),
+    Section('integrations', 'landing/partials/integrations.html', [load_integrations],
+            depends_on=['Integration', 'LandingPageSettings'], image_section='integrations'),
+    Section('pricing', 'landing/partials/pricing.html', [load_pricing_plans],
+            depends_on=['PricingPlan', 'LandingPageSettings'], image_section='pricing'),
+    Section('reviews', 'landing/partials/testimonials.html', [load_testimonials],
+            depends_on=['Testimonial', 'LandingPageSettings'], image_section='reviews'),
+    Section('stats', 'landing/partials/stats.html', [load_stats],
+            depends_on=['StatCounter']),
+    Section('faq', 'landing/partials/faq.html', [load_faqs],
+            depends_on=['FAQ', 'LandingPageSettings'], image_section='faq'),
+    Section('final_cta', 'landing/partials/final_cta.html',
+            depends_on=['LandingPageSettings']),
+    Section('footer', 'landing/partials/footer.html', [load_footer_links],
+            depends_on=['FooterLink', 'LandingPageSettings']),
+]
+
+
+def get_active_sections():
+    """Sections rendered on the page, in page order"""
+    return [section for section in SECTIONS if section.enabled]
+
+
+def load_section_context(sections):
+    """Run each loader needed by the given sections exactly once"""
+    context = {}
+    seen = set()
+    for section in sections:
+        for loader in section.loaders:
+            if loader not in seen:
+                seen.add(loader)
+                context.update(loader(sections))
+    return context
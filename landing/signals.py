@@ -0,0 +1,82 @@
+"""
+Signal handlers for RoyalERP Landing Page
+Invalidate cached content whenever admin-driven content changes
+"""
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from .assets import update_generated_assets
+from .cache import content_dependencies, schedule_dependency_bump
+from .database import apply_sqlite_pragmas
+from .export import schedule_export
+from .icons import SVG_FIELDS, normalize_svg_fields, update_icon_sprite
+from .images import IMAGE_FIELDS
+from .packed import schedule_snapshot_write
+from .models import LandingPageSettings, SectionImage, content_models
+from .tasks import enqueue_image_renditions, enqueue_video_metadata, start_on_first_request
+from .video import VIDEO_FIELDS
+
+
+def remember_previous_section(sender, instance, **kwargs):
+    """Record the section an existing image is moving away from"""
+    if instance.pk:
+        instance._previous_section = (
+            SectionImage.objects.filter(pk=instance.pk).values_list('section', flat=True).first()
+        )
+
+
+def content_changed(sender, instance, **kwargs):
+    """Any save or delete of landing content invalidates what depends on it"""
+    schedule_dependency_bump(content_dependencies(instance))
+    schedule_snapshot_write()
+    schedule_export()  # Runs after the bump so it renders fresh content
+
+
+def settings_saved(sender, instance, raw=False, **kwargs):
+    """Regenerate the theme-dependent stylesheets when the colours change"""
+    if not raw:
+        update_generated_assets(instance)
+
+
+def icon_normalized(sender, instance, raw=False, **kwargs):
+    """Store SVG icons minified, without editor metadata"""
+    if not raw:
+        normalize_svg_fields(instance)
+
+
+def icons_changed(sender, instance, raw=False, **kwargs):
+    """Add new icons to the sprite (unchanged icons leave it alone)"""
+    if not raw:
+        update_icon_sprite(LandingPageSettings.load(cached=False))
+
+
+def image_saved(sender, instance, raw=False, **kwargs):
+    """Queue responsive variants for newly uploaded images (built in the background)"""
+    if not raw:
+        enqueue_image_renditions(instance)
+
+
+def video_saved(sender, instance, raw=False, **kwargs):
+    """Queue container probing for newly uploaded videos"""
+    if not raw:
+        enqueue_video_metadata(instance)
+
+
+def connect_signals():
+    """Connect invalidation handlers for every content model in the landing app"""
+    for model in content_models():
+        post_save.connect(content_changed, sender=model, dispatch_uid=f'landing-save-{model._meta.label}')
+        post_delete.connect(content_changed, sender=model, dispatch_uid=f'landing-delete-{model._meta.label}')
+        if model.__name__ in IMAGE_FIELDS:
+            post_save.connect(image_saved, sender=model, dispatch_uid=f'landing-images-{model._meta.label}')
+        if model.__name__ in VIDEO_FIELDS:
+            post_save.connect(video_saved, sender=model, dispatch_uid=f'landing-videos-{model._meta.label}')
+        if model.__name__ in SVG_FIELDS:
+            pre_save.connect(icon_normalized, sender=model, dispatch_uid=f'landing-icons-pre-save-{model._meta.label}')
+            post_save.connect(icons_changed, sender=model, dispatch_uid=f'landing-icons-save-{model._meta.label}')
+            post_delete.connect(icons_changed, sender=model, dispatch_uid=f'landing-icons-delete-{model._meta.label}')
+    post_save.connect(settings_saved, sender=LandingPageSettings, dispatch_uid='landing-settings-assets')
+    pre_save.connect(remember_previous_section, sender=SectionImage, dispatch_uid='landing-section-image-pre-save')
+    request_started.connect(start_on_first_request, dispatch_uid='landing-media-resume')
+    connection_created.connect(apply_sqlite_pragmas, dispatch_uid='landing-sqlite-pragmas')
@@ -0,0 +1,92 @@
+"""
+Content snapshot for RoyalERP Landing Page
+One immutable, pre-built view of all rendered content per content version, kept per process
+and rebuilt when the content version in the shared cache changes
+"""
+import threading
+from types import MappingProxyType
+
+from django.conf import settings
+
+from .cache import get_content_version
+from .models import LandingPageSettings
+from .sections import get_active_sections, load_section_context
+
+
+def freeze(value):
+    """Recursively turn lists into tuples and dicts into read-only mappings"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ContentSnapshot:
+    """
+    Everything the landing templates need for one content version
+    Built once per publish and shared by every request until the version changes
+    """
+
+    __slots__ = ('version', 'settings', 'page_sections', 'data')
+
+    def __init__(self, version, settings, page_sections, data):
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'settings', settings)
+        object.__setattr__(self, 'page_sections', tuple(page_sections))
+        object.__setattr__(self, 'data', freeze(data))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ContentSnapshot is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('ContentSnapshot is immutable')
+
+    def get_context(self):
+        """Template context for this snapshot (a fresh dict per render)"""
+        context = dict(self.data)
+        context['settings'] = self.settings
+        context['page_sections'] = self.page_sections
+        return context
+
+
+def build_snapshot(version):
+    """Load all content for the active sections from the database"""
+    page_sections = get_active_sections()
+    return ContentSnapshot(
+        version=version,
+        settings=LandingPageSettings.load(),
+        page_sections=page_sections,
+        data=load_section_context(page_sections),
+    )
+
+
+_current_snapshot = None
+_build_lock = threading.Lock()
+
+
+def snapshot_enabled():
+    return getattr(settings, 'LANDING_CONTENT_SNAPSHOT', False)
+
+
+def get_snapshot():
+    """
+    Return the snapshot for the current content version
+    Rebuilt (once per process) only when the shared version has changed; built on every
+    call when LANDING_CONTENT_SNAPSHOT is off
+    """
+    global _current_snapshot
+    # Read the version before loading so content edited mid-build
+    # is picked up by the next request instead of being hidden
+    version = get_content_version()
+    if not snapshot_enabled():
+        return build_snapshot(version)
+    snapshot = _current_snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _build_lock:
+        snapshot = _current_snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = build_snapshot(version)
+            _current_snapshot = snapshot
+    return snapshot
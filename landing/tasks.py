@@ -0,0 +1,256 @@
+"""
+Background media processing for RoyalERP Landing Page
+In-process thread pool backed by the MediaJob table, so admin saves return immediately
+and queued work survives restarts (no Redis/Celery needed)
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import content_dependencies, schedule_dependency_bump
+from .export import schedule_export
+from .images import outdated_fields, update_renditions
+from .models import MediaJob
+from .packed import get_snapshot_path, schedule_snapshot_write
+from .video import outdated_video_fields, update_video_meta
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# A RUNNING job claimed on another host and untouched for this long is assumed to belong to a
+# dead worker (on this host the claiming process is checked directly)
+STALE_RUNNING_AFTER = timedelta(minutes=10)
+
+
+# ==================== TASKS ====================
+
+def build_image_renditions(instance):
+    return bool(update_renditions(instance))
+
+
+def probe_video_metadata(instance):
+    return bool(update_video_meta(instance))
+
+
+TASKS = {
+    'image_renditions': build_image_renditions,
+    'video_metadata': probe_video_metadata,
+}
+
+
+# ==================== QUEUE ====================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_worker_count():
+    return getattr(settings, 'LANDING_MEDIA_WORKERS', 2)
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_worker_count(), thread_name_prefix='landing-media')
+        return _executor
+
+
+def get_recheck_interval():
+    return getattr(settings, 'LANDING_MEDIA_RECHECK_INTERVAL', 300)
+
+
+_worker = {}
+
+
+def get_worker_id():
+    """host:pid:boot id of this process, recorded on the jobs it claims"""
+    pid = os.getpid()
+    if _worker.get('pid') != pid:  # Computed after a fork, never inherited from the parent
+        _worker.update(pid=pid, id=f'{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}')
+    return _worker['id']
+
+
+def worker_alive(worker):
+    """
+    Whether the process recorded in MediaJob.worker is still running
+    None when that can't be told: another host, Windows, or a job claimed before workers were recorded
+    """
+    try:
+        host, pid, _ = worker.rsplit(':', 2)
+        pid = int(pid)
+    except ValueError:
+        return None
+    if host != socket.gethostname() or os.name == 'nt':  # os.kill() terminates processes on Windows
+        return None
+    if pid == os.getpid():
+        return worker == get_worker_id()  # Same pid after a restart: the boot id differs
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Running, under another user
+    return True
+
+
+def submit(job_id):
+    """Run a job on the pool (inline when LANDING_MEDIA_WORKERS is 0)"""
+    if get_worker_count() == 0:
+        run_job(job_id)
+    else:
+        get_executor().submit(run_job_in_thread, job_id)
+
+
+def enqueue(kind, instance):
+    """
+    Record a job for `instance` and start it once the current transaction commits
+    A job already pending for the same object is reused
+    """
+    model_name = type(instance).__name__
+    job = MediaJob.objects.filter(
+        kind=kind, model_name=model_name, object_id=instance.pk, status='PENDING'
+    ).first()
+    if job is None:
+        job = MediaJob.objects.create(kind=kind, model_name=model_name, object_id=instance.pk)
+    transaction.on_commit(lambda: submit(job.pk))
+    return job
+
+
+def enqueue_image_renditions(instance):
+    if outdated_fields(instance):
+        enqueue('image_renditions', instance)
+
+
+def enqueue_video_metadata(instance):
+    if outdated_video_fields(instance):
+        enqueue('video_metadata', instance)
+
+
+def run_job_in_thread(job_id):
+    """Pool entry point: each worker thread manages its own DB connection"""
+    close_old_connections()
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception('Media job %s crashed', job_id)
+    finally:
+        connection.close()
+
+
+def run_job(job_id):
+    """Claim, run and record the outcome of one job"""
+    # Conditional update so two workers (or processes) never run the same job
+    claimed = MediaJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING', attempts=F('attempts') + 1, worker=get_worker_id(), updated_at=timezone.now()
+    )
+    if not claimed:
+        return
+    job = MediaJob.objects.get(pk=job_id)
+    instance = apps.get_model('landing', job.model_name).objects.filter(pk=job.object_id).first()
+    try:
+        changed = instance is not None and TASKS[job.kind](instance)
+    except Exception as exc:
+        logger.exception('Media job %s failed', job)
+        status = 'FAILED' if job.attempts >= MAX_ATTEMPTS else 'PENDING'
+        MediaJob.objects.filter(pk=job.pk).update(status=status, error=str(exc), updated_at=timezone.now())
+        if status == 'PENDING':
+            transaction.on_commit(lambda: submit(job.pk))
+        return
+    MediaJob.objects.filter(pk=job.pk).update(status='DONE', error='', updated_at=timezone.now())
+    if changed:
+        # Task results are written with update(), so publish them explicitly
+        schedule_dependency_bump(content_dependencies(instance))
+        schedule_snapshot_write()
+        schedule_export()
+
+
+def requeue_abandoned_jobs():
+    """
+    Put RUNNING jobs whose worker died back in the queue
+    Jobs of a dead process on this host are requeued at once, so a quick restart doesn't strand
+    them; jobs claimed elsewhere only once they're older than STALE_RUNNING_AFTER
+    """
+    stale = timezone.now() - STALE_RUNNING_AFTER
+    requeued = 0
+    for pk, worker, updated_at in MediaJob.objects.filter(status='RUNNING').values_list('pk', 'worker', 'updated_at'):
+        alive = worker_alive(worker)
+        if alive is False or (alive is None and updated_at < stale):
+            requeued += MediaJob.objects.filter(pk=pk, status='RUNNING', worker=worker).update(
+                status='PENDING', updated_at=timezone.now()
+            )
+    return requeued
+
+
+def pending_job_ids():
+    """Pending jobs plus RUNNING jobs abandoned by a worker that died"""
+    requeue_abandoned_jobs()
+    return list(MediaJob.objects.filter(status='PENDING').values_list('pk', flat=True))
+
+
+def resume_pending_jobs():
+    """Re-submit jobs left over from a previous run"""
+    for job_id in pending_job_ids():
+        submit(job_id)
+
+
+_recheck_thread = None
+
+
+def resume_in_thread():
+    """Thread body: resume_pending_jobs() on the thread's own DB connection"""
+    close_old_connections()
+    try:
+        resume_pending_jobs()
+    except Exception:
+        logger.exception('Could not resume pending media jobs')
+    finally:
+        connection.close()
+
+
+def recheck_periodically(interval):
+    """Thread body: resume pending and abandoned jobs every `interval` seconds"""
+    while True:
+        time.sleep(interval)
+        resume_in_thread()
+
+
+def start_recheck_thread():
+    """Recover jobs of workers that die while this process keeps running (once per process)"""
+    global _recheck_thread
+    interval = get_recheck_interval()
+    with _executor_lock:
+        if _recheck_thread is None and interval:
+            _recheck_thread = threading.Thread(
+                target=recheck_periodically, args=(interval,), name='landing-media-recheck', daemon=True
+            )
+            _recheck_thread.start()
+
+
+def start_on_first_request(sender, **kwargs):
+    """request_started hook: resume queued work once per process, then keep checking in the background"""
+    from django.core.signals import request_started
+
+    request_started.disconnect(start_on_first_request, dispatch_uid='landing-media-resume')
+    if get_snapshot_path():
+        # Landing requests render from the snapshot file without a database connection; don't
+        # make the first one wait on the job queries
+        threading.Thread(target=resume_in_thread, name='landing-media-resume', daemon=True).start()
+    else:
+        try:
+            resume_pending_jobs()
+        except Exception:
+            logger.exception('Could not resume pending media jobs')
+    start_recheck_thread()
@@ -0,0 +1,111 @@
+"""
+Template tags for generated landing page assets
+Usage: {% load landing_assets %}
+       <link rel="stylesheet" href="{{ settings.generated_assets.utilities.name|asset_url }}">
+       {% section_stylesheets page_sections deferred=critical_css %}
+       {% stylesheet url deferred=critical_css %}
+       {% svg_icon feature.icon %} ... {% icon_sprite section_fragments %}
+"""
+import re
+
+from django import template
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from landing.css_split import BASE_BUNDLE, SOURCE_NAME, get_css_bundles
+from landing.icons import ID_LIST_ATTRIBUTES, SPRITE_KIND, get_icon, inline_sprite, read_sprite, sprite_inlined
+
+register = template.Library()
+
+# Local symbol references written by svg_icon when the sprite is inlined
+LOCAL_USE_RE = re.compile(r'<use href="#([^"]+)"')
+
+
+@register.filter
+def asset_url(name):
+    """URL of a generated file in media storage"""
+    return default_storage.url(name) if name else ''
+
+
+def stylesheet_link(href, deferred=False):
+    """A render-blocking <link>, or a preload that applies itself once loaded (with a no-JS fallback)"""
+    if deferred:
+        return format_html(
+            '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            '<noscript><link rel="stylesheet" href="{0}"></noscript>', href
+        )
+    return format_html('<link rel="stylesheet" href="{}">', href)
+
+
+@register.simple_tag
+def stylesheet(href, deferred=False):
+    return stylesheet_link(href, bool(deferred))
+
+
+@register.simple_tag
+def section_stylesheets(page_sections, deferred=False):
+    """
+    Link the shared landing.css bundle plus the bundles of the rendered sections
+    Falls back to the full landing.css until the bundles are built (manage.py split_landing_css)
+    Loads them without blocking render when `deferred` (critical CSS is inlined)
+    """
+    bundles = get_css_bundles()
+    if bundles is None:
+        return stylesheet_link(static(SOURCE_NAME), bool(deferred))
+    names = [BASE_BUNDLE] + [section.key for section in page_sections]
+    return format_html_join(
+        '\n', '{}', ((stylesheet_link(static(bundles[name]), bool(deferred)),) for name in names if name in bundles)
+    )
+
+
+@register.simple_tag(takes_context=True)
+def icon_sprite(context, fragments):
+    """
+    The symbols the rendered `fragments` use, inlined once per page when the sprite is on
+    another origin (see landing.icons.sprite_inlined); nothing when cards link the sprite file
+    """
+    sprite = get_sprite(context)
+    if not sprite or not sprite_inlined(sprite['name']) or not sprite_available(sprite['name']):
+        return ''
+    symbol_ids = {symbol_id for html in fragments for symbol_id in LOCAL_USE_RE.findall(str(html))}
+    return mark_safe(inline_sprite(sprite['name'], symbol_ids))
+
+
+@register.simple_tag(takes_context=True)
+def svg_icon(context, markup):
+    """
+    An icon stored as SVG markup, drawn from the sprite with <use href>: the cached sprite file on
+    the page's origin, or the page's inlined copy ({% icon_sprite %}) when the file is on another
+    Markup that isn't in the sprite (not SVG, or saved before it was rebuilt) is inlined as before,
+    and so are icons labelled by an element inside them, which a linked file can't provide
+    Icons without a label are decorative and hidden from screen readers
+    """
+    icon = get_icon(markup) if markup else None
+    sprite = get_sprite(context)
+    if icon is None or not sprite or icon.symbol_id not in sprite['symbols'] or not sprite_available(sprite['name']):
+        return mark_safe(markup or '')
+    inlined = sprite_inlined(sprite['name'])
+    if not inlined and ID_LIST_ATTRIBUTES & set(icon.use_attributes):
+        return mark_safe(markup)
+    attributes = dict(icon.use_attributes)
+    if not icon.labelled:
+        attributes.setdefault('aria-hidden', 'true')
+    href = '' if inlined else asset_url(sprite['name'])
+    return format_html(
+        '<svg{}><use href="{}#{}"/></svg>', format_html_join('', ' {}="{}"', attributes.items()), href, icon.symbol_id
+    )
+
+
+def get_sprite(context):
+    landing_settings = context.get('settings')
+    return (getattr(landing_settings, 'generated_assets', None) or {}).get(SPRITE_KIND)
+
+
+def sprite_available(name):
+    try:
+        read_sprite(name)
+    except OSError:
+        return False
+    return True
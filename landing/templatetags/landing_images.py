@@ -0,0 +1,77 @@
+"""
+Template tags for responsive landing page images and videos
+Usage: {% load landing_images %}
+       {% responsive_image feature.image feature.image_renditions sizes="400px" alt=feature.title class="feature-image" %}
+       {% video_meta section.video section.video_meta as meta %}
+"""
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from landing.video import PLAYABLE_MIME, guess_mime, playable_mime
+
+register = template.Library()
+
+
+def build_srcset(variants):
+    return ', '.join(f'{default_storage.url(v["name"])} {v["width"]}w' for v in variants)
+
+
+def is_contained(attrs):
+    """object-fit: contain letterboxes the image, and a placeholder would show in the empty bands"""
+    style = (attrs.get('style') or '').replace(' ', '')
+    return 'object-contain' in (attrs.get('class') or '').split() or 'object-fit:contain' in style
+
+
+@register.simple_tag
+def responsive_image(file, renditions=None, sizes='100vw', **attrs):
+    """
+    Render a <picture> with a WebP source and a fallback srcset
+    Emits the intrinsic width/height and an inline blurred placeholder when known, removed once
+    the image has loaded and skipped for object-contain images
+    Falls back to a plain <img> of the original until variants exist
+    """
+    if not file:
+        return ''
+    renditions = renditions or {}
+    if renditions.get('source') != file.name:
+        renditions = {}  # Stale: the file was replaced and variants aren't built yet
+
+    if renditions.get('width'):
+        attrs['width'], attrs['height'] = renditions['width'], renditions['height']
+        style = [attrs.get('style') or '', f'aspect-ratio: {renditions["width"]} / {renditions["height"]};']
+        if renditions.get('placeholder') and not is_contained(attrs):
+            style.append(f'background: url({renditions["placeholder"]}) center / cover no-repeat;')
+            # Transparent images would show the blur through them once loaded
+            attrs['onload'] = "this.style.backgroundImage='none'"
+        attrs['style'] = ' '.join(part.strip() for part in style if part)
+    attributes = format_html_join(' ', '{}="{}"', ((name, value) for name, value in attrs.items() if value is not None))
+
+    variants = renditions.get('variants')
+    if not variants:
+        return format_html('<img src="{}" {}>', file.url, attributes)
+
+    webp = [v for v in variants if v['format'] == 'webp']
+    fallback = [v for v in variants if v['format'] != 'webp']
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        build_srcset(webp), sizes,
+        default_storage.url(fallback[-1]['name']), build_srcset(fallback), sizes, attributes,
+    )
+
+
+@register.simple_tag
+def video_meta(file, meta=None):
+    """
+    Probed MIME type, width, height and duration of an uploaded video
+    Until the file has been probed only a MIME type guessed from the extension is known
+    """
+    if not file:
+        return {}
+    meta = meta or {}
+    if meta.get('source') != file.name:
+        meta = {'mime': guess_mime(file.name)}
+    elif meta.get('mime') in PLAYABLE_MIME:
+        meta = {**meta, 'mime': playable_mime(meta['mime'])}  # Probed before the types were mapped
+    return meta
@@ -0,0 +1,228 @@
+"""
+Tests for RoyalERP Landing Page
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.templatetags.admin_list import results
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection, connections
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from PIL import Image
+
+from .admin import ProjectedListAdmin
+from .models import (
+    FAQ, Feature, FooterLink, Integration, LandingPageSettings, MediaJob, PricingPlan, SectionBlock,
+    SectionImage, StatCounter, Testimonial, UseCasePoint,
+)
+from .records import track_missing_fields
+from .sections import SECTIONS, load_section_context
+from .tasks import run_job
+
+
+ICON = '<svg viewBox="0 0 24 24"><path d="M5 13l4 4L19 7"/></svg>'
+TEST_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    'STORAGES': {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+}
+
+
+def image_file(name, mode='RGB'):
+    buffer = BytesIO()
+    Image.new(mode, (64, 48), 'navy').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def video_file(name):
+    # An empty ISO BMFF file: just the ftyp box
+    return SimpleUploadedFile(name, b'\x00\x00\x00\x14ftypisom\x00\x00\x02\x00isom', content_type='video/mp4')
+
+
+def create_content():
+    """A row for every content model with every rendered field filled in"""
+    landing_settings = LandingPageSettings.load(cached=False)
+    landing_settings.hero_image = image_file('hero.png')
+    landing_settings.logo_image = image_file('logo.png', 'RGBA')
+    landing_settings.social_twitter = 'https://twitter.com/royalerp'
+    landing_settings.social_whatsapp = '+1234567890'
+    landing_settings.save()
+
+    Feature.objects.create(title='Reports', description='Ask for any report', icon=ICON, image=image_file('feature.png'))
+    Feature.objects.create(title='Alerts', description='Stock alerts', icon='fa-bell', order=1)
+    SectionBlock.objects.create(
+        key='automation', title='Automation', subtitle='Hands off', body='Runs itself', bullets='One\nTwo',
+        media_type='VIDEO', video=video_file('demo.mp4'), video_poster=image_file('poster.png'),
+        layout_type='RIGHT_IMAGE', background_style='GRADIENT', cta_label='Try it', cta_url='https://example.com',
+        secondary_cta_label='Docs', secondary_cta_url='https://example.com/docs',
+    )
+    SectionBlock.objects.create(
+        key='use_cases', title='Use cases', subtitle='Everywhere', bullets='Sales\nStock',
+        image=image_file('use-cases.png'), background_style='LIGHT', order=1,
+    )
+    UseCasePoint.objects.create(title='Sales', body='Daily sales on WhatsApp', icon=ICON)
+    Integration.objects.create(
+        name='WhatsApp', description='Chat with your ERP', icon_svg=ICON, icon_color='green',
+        bullets='Orders\nInvoices', url='https://example.com/whatsapp', is_featured=True,
+    )
+    Integration.objects.create(name='Database', icon=image_file('database.png'), order=1)
+    PricingPlan.objects.create(name='Starter', price='$29', bullets='One user\nEmail support')
+    PricingPlan.objects.create(name='Business', price='$99', bullets='Ten users', is_featured=True, order=1)
+    Testimonial.objects.create(
+        name='Sam', role='CFO', company='Acme', avatar=image_file('avatar.png'), rating=5, text='Saves hours',
+    )
+    Testimonial.objects.create(name='Alex', role='COO', company='Initech', rating=4, text='Quick answers', order=1)
+    StatCounter.objects.create(label='Users', value='10K+', icon=ICON)
+    StatCounter.objects.create(label='Uptime', value='99%', order=1)
+    FAQ.objects.create(question='Is it secure?', answer='Yes')
+    FooterLink.objects.create(column_name='Product', label='Pricing', url='#pricing')
+    FooterLink.objects.create(column_name='Company', label='About', url='https://example.com/about')
+    for index, (section, _) in enumerate(SectionImage.SECTION_CHOICES):
+        SectionImage.objects.create(
+            section=section, image=image_file(f'{section}.png'), subtitle=section.title(), alt_text=section,
+            link_url='https://example.com', order=index,
+        )
+
+    # Run the media jobs the saves queued (they'd start after commit), so renditions are rendered too
+    for job_id in MediaJob.objects.filter(status='PENDING').values_list('pk', flat=True):
+        run_job(job_id)
+
+
+class LandingTestCase(TestCase):
+    """Runs with TEST_SETTINGS and its own MEDIA_ROOT, removed after the class"""
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp(prefix='landing-tests-')
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        test_settings = override_settings(MEDIA_ROOT=media_root, **TEST_SETTINGS)
+        test_settings.enable()
+        cls.addClassCleanup(test_settings.disable)
+        super().setUpClass()
+
+
+class LandingQueriesTests(LandingTestCase):
+    """Partials and admin change lists must render from what their loaders fetched"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_content()
+
+    def test_partials_read_only_loaded_fields(self):
+        context = load_section_context(SECTIONS)
+        context['settings'] = LandingPageSettings.load()
+        request = RequestFactory().get('/')
+        for section in SECTIONS:
+            with self.subTest(section=section.key):
+                with self.assertNumQueries(0), track_missing_fields() as missing:
+                    html = render_to_string(section.template, context, request)
+                self.assertEqual(missing, set())
+                self.assertTrue(html.strip())
+
+    def test_change_lists_read_only_listed_fields(self):
+        request = RequestFactory().get('/')
+        request.user = get_user_model()(is_active=True, is_staff=True, is_superuser=True)
+        for model, model_admin in admin.site._registry.items():
+            if not isinstance(model_admin, ProjectedListAdmin):
+                continue
+            with self.subTest(model=model._meta.label):
+                changelist = model_admin.get_changelist_instance(request)
+                changelist.formset = None  # Editable columns render as plain values
+                self.assertTrue(list(changelist.result_list))
+                with self.assertNumQueries(0):
+                    for row in results(changelist):
+                        list(row)
+
+
+class LandingValidatorsTests(LandingTestCase):
+    """The ETag changes with the templates and static files, not only with the content"""
+
+    def test_deploy_changes_etag(self):
+        etag = self.client.get('/')['ETag']
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch('landing.cache.code_fingerprint', return_value='new-release'):
+            response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite connection profile')
+class SQLiteProfileTests(TransactionTestCase):
+    """Connections get LANDING_SQLITE_PRAGMAS, so reads don't wait for an admin write"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix='landing-sqlite-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'landing.sqlite3')
+
+    def connect(self, alias):
+        """A new Django connection to the test file; connection_created applies the pragmas when it opens"""
+        default = connections['default']
+        return type(default)({**default.settings_dict, 'NAME': self.path}, alias)
+
+    def open(self, alias):
+        db = self.connect(alias)
+        db.ensure_connection()
+        self.addCleanup(db.close)
+        return db
+
+    def read_while_writing(self):
+        """Seconds a read took, or the error it raised, while another connection held an exclusive write lock"""
+        writer = self.open('writer')
+        with writer.cursor() as cursor:
+            cursor.execute('CREATE TABLE IF NOT EXISTS item (id INTEGER PRIMARY KEY)')
+            cursor.execute('INSERT INTO item DEFAULT VALUES')
+            cursor.execute('BEGIN EXCLUSIVE')
+            cursor.execute('INSERT INTO item DEFAULT VALUES')
+        outcome = {}
+
+        def reader():
+            db = self.connect('reader')  # Opened in this thread, which Django connections require
+            try:
+                started = time.perf_counter()
+                with db.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM item')
+                    outcome['rows'] = cursor.fetchone()[0]
+                outcome['seconds'] = time.perf_counter() - started
+            except OperationalError as exc:
+                outcome['error'] = exc
+            finally:
+                db.close()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join(timeout=10)
+        with writer.cursor() as cursor:
+            cursor.execute('ROLLBACK')
+        self.assertFalse(thread.is_alive(), 'The read was still waiting for the writer')
+        return outcome
+
+    def test_connections_use_wal(self):
+        with self.open('landing').cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], settings.LANDING_SQLITE_PRAGMAS['busy_timeout'])
+
+    # A blocked read gives up before read_while_writing() stops waiting for it
+    @override_settings(LANDING_SQLITE_PRAGMAS={**settings.LANDING_SQLITE_PRAGMAS, 'busy_timeout': 5000})
+    def test_reads_dont_wait_for_writer(self):
+        outcome = self.read_while_writing()
+        self.assertNotIn('error', outcome)
+        self.assertEqual(outcome['rows'], 1)  # The last committed state
+        self.assertLess(outcome['seconds'], 1)
+
+    @override_settings(LANDING_SQLITE_PRAGMAS={'busy_timeout': 0, 'journal_mode': 'DELETE'})
+    def test_rollback_journal_blocks_reads(self):
+        """Without the profile the same read fails on the lock (what the WAL profile avoids)"""
+        self.assertIn('error', self.read_while_writing())
@@ -0,0 +1,621 @@
+"""
+Build-time utility stylesheet for RoyalERP Landing Page
+Scans templates and scripts for Tailwind-style utility classes and compiles only those in use
+into a minified stylesheet, with the admin theme colours baked in (replaces the Tailwind CDN)
+"""
+import glob
+import hashlib
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+
+# Bump when the compiler's output changes so stored stylesheets are rebuilt
+UTILITY_CSS_SCHEMA = 2
+
+# Files scanned for class names, relative to BASE_DIR
+UTILITY_SOURCES = ('templates/**/*.html', 'static/js/**/*.js')
+
+CANDIDATE_RE = re.compile(r'[\w:/.\-]+(?:\[[^\]\s"\'{}]*\])?[\w/.\-]*')
+
+SCREENS = (('sm', 640), ('md', 768), ('lg', 1024), ('xl', 1280), ('2xl', 1536))
+STATE_VARIANTS = {'hover': ':hover', 'focus': ':focus', 'active': ':active'}
+
+FONT_SANS = 'Inter,system-ui,sans-serif'
+
+# Theme colours configurable from LandingPageSettings, with the model defaults
+THEME_COLORS = {
+    'primary': ('primary_color', '#1e3a5f'),
+    'secondary': ('secondary_color', '#6366f1'),
+    'accent': ('accent_color', '#ec4899'),
+}
+
+# Subset of the default Tailwind palette
+PALETTE = {
+    'slate': {50: '#f8fafc', 100: '#f1f5f9', 200: '#e2e8f0', 300: '#cbd5e1', 400: '#94a3b8', 500: '#64748b',
+              600: '#475569', 700: '#334155', 800: '#1e293b', 900: '#0f172a'},
+    'gray': {50: '#f9fafb', 100: '#f3f4f6', 200: '#e5e7eb', 300: '#d1d5db', 400: '#9ca3af', 500: '#6b7280',
+             600: '#4b5563', 700: '#374151', 800: '#1f2937', 900: '#111827'},
+    'red': {50: '#fef2f2', 100: '#fee2e2', 200: '#fecaca', 300: '#fca5a5', 400: '#f87171', 500: '#ef4444',
+            600: '#dc2626', 700: '#b91c1c', 800: '#991b1b', 900: '#7f1d1d'},
+    'orange': {50: '#fff7ed', 100: '#ffedd5', 200: '#fed7aa', 300: '#fdba74', 400: '#fb923c', 500: '#f97316',
+               600: '#ea580c', 700: '#c2410c', 800: '#9a3412', 900: '#7c2d12'},
+    'yellow': {50: '#fefce8', 100: '#fef9c3', 200: '#fef08a', 300: '#fde047', 400: '#facc15', 500: '#eab308',
+               600: '#ca8a04', 700: '#a16207', 800: '#854d0e', 900: '#713f12'},
+    'green': {50: '#f0fdf4', 100: '#dcfce7', 200: '#bbf7d0', 300: '#86efac', 400: '#4ade80', 500: '#22c55e',
+              600: '#16a34a', 700: '#15803d', 800: '#166534', 900: '#14532d'},
+    'sky': {50: '#f0f9ff', 100: '#e0f2fe', 200: '#bae6fd', 300: '#7dd3fc', 400: '#38bdf8', 500: '#0ea5e9',
+            600: '#0284c7', 700: '#0369a1', 800: '#075985', 900: '#0c4a6e'},
+    'blue': {50: '#eff6ff', 100: '#dbeafe', 200: '#bfdbfe', 300: '#93c5fd', 400: '#60a5fa', 500: '#3b82f6',
+             600: '#2563eb', 700: '#1d4ed8', 800: '#1e40af', 900: '#1e3a8a'},
+    'indigo': {50: '#eef2ff', 100: '#e0e7ff', 200: '#c7d2fe', 300: '#a5b4fc', 400: '#818cf8', 500: '#6366f1',
+               600: '#4f46e5', 700: '#4338ca', 800: '#3730a3', 900: '#312e81'},
+    'purple': {50: '#faf5ff', 100: '#f3e8ff', 200: '#e9d5ff', 300: '#d8b4fe', 400: '#c084fc', 500: '#a855f7',
+               600: '#9333ea', 700: '#7e22ce', 800: '#6b21a8', 900: '#581c87'},
+    'pink': {50: '#fdf2f8', 100: '#fce7f3', 200: '#fbcfe8', 300: '#f9a8d4', 400: '#f472b6', 500: '#ec4899',
+             600: '#db2777', 700: '#be185d', 800: '#9d174d', 900: '#831843'},
+}
+NAMED_COLORS = {'white': '#ffffff', 'black': '#000000', 'transparent': 'transparent', 'current': 'currentColor'}
+
+FONT_SIZES = {
+    'xs': ('.75rem', '1rem'), 'sm': ('.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'),
+}
+FONT_WEIGHTS = {'light': 300, 'normal': 400, 'medium': 500, 'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900}
+MAX_WIDTHS = {
+    'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem', '2xl': '42rem', '3xl': '48rem',
+    '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem', 'full': '100%', 'none': 'none',
+}
+RADII = {'none': '0px', 'sm': '.125rem', '': '.25rem', 'md': '.375rem', 'lg': '.5rem', 'xl': '.75rem',
+         '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+RADIUS_SIDES = {
+    '': ('border-radius',),
+    't': ('border-top-left-radius', 'border-top-right-radius'),
+    'b': ('border-bottom-right-radius', 'border-bottom-left-radius'),
+    'l': ('border-top-left-radius', 'border-bottom-left-radius'),
+    'r': ('border-top-right-radius', 'border-bottom-right-radius'),
+    'tl': ('border-top-left-radius',), 'tr': ('border-top-right-radius',),
+    'bl': ('border-bottom-left-radius',), 'br': ('border-bottom-right-radius',),
+}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0/.05)',
+    '': '0 1px 3px 0 rgb(0 0 0/.1),0 1px 2px -1px rgb(0 0 0/.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0/.1),0 2px 4px -2px rgb(0 0 0/.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0/.1),0 4px 6px -4px rgb(0 0 0/.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0/.1),0 8px 10px -6px rgb(0 0 0/.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0/.25)',
+    'none': '0 0 #0000',
+}
+BLURS = {'none': '0', 'sm': '4px', '': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px'}
+GRADIENT_DIRECTIONS = {
+    't': 'to top', 'tr': 'to top right', 'r': 'to right', 'br': 'to bottom right',
+    'b': 'to bottom', 'bl': 'to bottom left', 'l': 'to left', 'tl': 'to top left',
+}
+TRANSITIONS = {
+    '': 'color,background-color,border-color,text-decoration-color,fill,stroke,opacity,box-shadow,transform,filter,backdrop-filter',
+    'all': 'all',
+    'colors': 'color,background-color,border-color,text-decoration-color,fill,stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+
+TRANSFORM = ('translate(var(--tw-translate-x),var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+FILTER = ('var(--tw-blur) var(--tw-brightness) var(--tw-contrast) var(--tw-grayscale) var(--tw-hue-rotate) '
+          'var(--tw-invert) var(--tw-saturate) var(--tw-sepia) var(--tw-drop-shadow)')
+BACKDROP_FILTER = ('var(--tw-backdrop-blur) var(--tw-backdrop-brightness) var(--tw-backdrop-contrast) '
+                   'var(--tw-backdrop-grayscale) var(--tw-backdrop-hue-rotate) var(--tw-backdrop-invert) '
+                   'var(--tw-backdrop-opacity) var(--tw-backdrop-saturate) var(--tw-backdrop-sepia)')
+BOX_SHADOW = 'var(--tw-ring-offset-shadow,0 0 #0000),var(--tw-ring-shadow,0 0 #0000),var(--tw-shadow)'
+
+# Tailwind's preflight (v3) plus the custom-property defaults utilities rely on
+PREFLIGHT = (
+    "*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}"
+    "::before,::after{--tw-content:''}"
+    "html,:host{line-height:1.5;-webkit-text-size-adjust:100%;-moz-tab-size:4;tab-size:4;"
+    "font-family:" + FONT_SANS + ";font-feature-settings:normal;font-variation-settings:normal;"
+    "-webkit-tap-highlight-color:transparent}"
+    "body{margin:0;line-height:inherit}"
+    "hr{height:0;color:inherit;border-top-width:1px}"
+    "abbr:where([title]){text-decoration:underline dotted}"
+    "h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}"
+    "a{color:inherit;text-decoration:inherit}"
+    "b,strong{font-weight:bolder}"
+    "code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,\"Liberation Mono\","
+    "\"Courier New\",monospace;font-feature-settings:normal;font-variation-settings:normal;font-size:1em}"
+    "small{font-size:80%}"
+    "sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}"
+    "sub{bottom:-.25em}sup{top:-.5em}"
+    "table{text-indent:0;border-color:inherit;border-collapse:collapse}"
+    "button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;"
+    "font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;"
+    "letter-spacing:inherit;color:inherit;margin:0;padding:0}"
+    "button,select{text-transform:none}"
+    "button,input:where([type='button']),input:where([type='reset']),input:where([type='submit'])"
+    "{-webkit-appearance:button;background-color:transparent;background-image:none}"
+    ":-moz-focusring{outline:auto}:-moz-ui-invalid{box-shadow:none}"
+    "progress{vertical-align:baseline}"
+    "::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}"
+    "[type='search']{-webkit-appearance:textfield;outline-offset:-2px}"
+    "::-webkit-search-decoration{-webkit-appearance:none}"
+    "::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}"
+    "summary{display:list-item}"
+    "blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}"
+    "fieldset{margin:0;padding:0}legend{padding:0}"
+    "ol,ul,menu{list-style:none;margin:0;padding:0}"
+    "dialog{padding:0}textarea{resize:vertical}"
+    "input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}"
+    "button,[role=\"button\"]{cursor:pointer}:disabled{cursor:default}"
+    "img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}"
+    "img,video{max-width:100%;height:auto}"
+    "[hidden]{display:none}"
+    "*,::before,::after,::backdrop{--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-skew-x:0;"
+    "--tw-skew-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-gradient-from-position: ;--tw-gradient-via-position: ;"
+    "--tw-gradient-to-position: ;--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;"
+    "--tw-shadow:0 0 #0000;--tw-blur: ;--tw-brightness: ;--tw-contrast: ;--tw-grayscale: ;"
+    "--tw-hue-rotate: ;--tw-invert: ;--tw-saturate: ;--tw-sepia: ;--tw-drop-shadow: ;"
+    "--tw-backdrop-blur: ;--tw-backdrop-brightness: ;--tw-backdrop-contrast: ;--tw-backdrop-grayscale: ;"
+    "--tw-backdrop-hue-rotate: ;--tw-backdrop-invert: ;--tw-backdrop-opacity: ;--tw-backdrop-saturate: ;"
+    "--tw-backdrop-sepia: }"
+)
+
+
+# ==================== THEME ====================
+
+HEX_RE = re.compile(r'^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+
+
+def get_theme_colors(landing_settings=None):
+    """Theme colours from the admin, falling back to the defaults for empty or invalid values"""
+    colors = {}
+    for name, (field, default) in THEME_COLORS.items():
+        value = (getattr(landing_settings, field, '') or '').strip()
+        if not HEX_RE.match(value):
+            value = default
+        elif len(value) == 4:
+            value = '#' + ''.join(c * 2 for c in value[1:])  # Templates append alpha digits
+        colors[name] = value.lower()
+    return colors
+
+
+def hex_to_rgb(value):
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def with_alpha(color, alpha):
+    """`color` at `alpha` (0-1) opacity; None leaves it opaque"""
+    if alpha is None or not color.startswith('#'):
+        return color
+    r, g, b = hex_to_rgb(color)
+    return f'rgb({r} {g} {b}/{format_number(alpha)})'
+
+
+def format_number(value):
+    text = f'{value:.4f}'.rstrip('0').rstrip('.')
+    return text[1:] if text.startswith('0.') else text
+
+
+# ==================== UTILITIES ====================
+
+def spacing(value):
+    """Tailwind spacing scale: 4 -> 1rem, 0.5 -> .125rem, px -> 1px, [..] -> arbitrary"""
+    if value == 'px':
+        return '1px'
+    if value == '0':
+        return '0px'
+    if value.startswith('[') and value.endswith(']'):
+        return value[1:-1].replace('_', ' ')
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if number < 0 or number * 4 != int(number * 4):
+        return None
+    return format_number(number / 4) + 'rem'
+
+
+def fraction(value):
+    if '/' in value:
+        top, bottom = value.split('/', 1)
+        if top.isdigit() and bottom.isdigit() and int(bottom):
+            return format_number(int(top) / int(bottom) * 100) + '%'
+    return None
+
+
+def size_value(value, extra):
+    """Width/height value: spacing scale, fractions, keywords or arbitrary"""
+    if value in extra:
+        return extra[value]
+    return fraction(value) or spacing(value)
+
+
+class Theme:
+    """Resolves colour names against the palette plus the admin theme colours"""
+
+    def __init__(self, colors):
+        self.colors = colors
+
+    def color(self, value):
+        """'gray-500', 'white/20', 'primary/10' -> CSS colour or None"""
+        name, _, opacity = value.partition('/')
+        alpha = None
+        if opacity:
+            if not opacity.isdigit():
+                return None
+            alpha = int(opacity) / 100
+        if name in self.colors:
+            return with_alpha(self.colors[name], alpha)
+        if name in NAMED_COLORS:
+            return with_alpha(NAMED_COLORS[name], alpha)
+        family, _, shade = name.rpartition('-')
+        if family in PALETTE and shade.isdigit() and int(shade) in PALETTE[family]:
+            return with_alpha(PALETTE[family][int(shade)], alpha)
+        return None
+
+    def transparent(self, value):
+        """The colour at zero opacity, for gradient ends"""
+        color = self.color(value.partition('/')[0])
+        if color and color.startswith('#'):
+            return with_alpha(color, 0)
+        return 'rgb(255 255 255/0)'
+
+
+def static_utilities():
+    return {
+        'static': ['position:static'], 'fixed': ['position:fixed'], 'absolute': ['position:absolute'],
+        'relative': ['position:relative'], 'sticky': ['position:sticky'],
+        'block': ['display:block'], 'inline-block': ['display:inline-block'], 'inline': ['display:inline'],
+        'flex': ['display:flex'], 'inline-flex': ['display:inline-flex'], 'grid': ['display:grid'],
+        'hidden': ['display:none'],
+        'flex-row': ['flex-direction:row'], 'flex-col': ['flex-direction:column'],
+        'flex-wrap': ['flex-wrap:wrap'], 'flex-1': ['flex:1 1 0%'], 'flex-shrink-0': ['flex-shrink:0'],
+        'shrink-0': ['flex-shrink:0'], 'flex-grow': ['flex-grow:1'],
+        'items-start': ['align-items:flex-start'], 'items-center': ['align-items:center'],
+        'items-end': ['align-items:flex-end'],
+        'justify-start': ['justify-content:flex-start'], 'justify-center': ['justify-content:center'],
+        'justify-between': ['justify-content:space-between'], 'justify-end': ['justify-content:flex-end'],
+        'overflow-hidden': ['overflow:hidden'], 'overflow-auto': ['overflow:auto'],
+        'object-contain': ['object-fit:contain'], 'object-cover': ['object-fit:cover'],
+        'text-left': ['text-align:left'], 'text-center': ['text-align:center'], 'text-right': ['text-align:right'],
+        'italic': ['font-style:italic'], 'uppercase': ['text-transform:uppercase'],
+        'font-sans': ['font-family:' + FONT_SANS],
+        'antialiased': ['-webkit-font-smoothing:antialiased', '-moz-osx-font-smoothing:grayscale'],
+        'scroll-smooth': ['scroll-behavior:smooth'],
+        'tracking-tight': ['letter-spacing:-.025em'], 'tracking-wide': ['letter-spacing:.025em'],
+        'tracking-wider': ['letter-spacing:.05em'], 'tracking-widest': ['letter-spacing:.1em'],
+        'invert': ['--tw-invert:invert(100%)', 'filter:' + FILTER],
+        'cursor-pointer': ['cursor:pointer'],
+        'pointer-events-none': ['pointer-events:none'],
+    }
+
+
+STATIC = static_utilities()
+
+# Tailwind's core plugin order (the subset compiled here): a later plugin wins over an earlier one
+# on the same element, e.g. duration-300 over the 150ms default set by transition
+PLUGIN_ORDER = (
+    'pointer-events', 'position', 'inset', 'z-index', 'order', 'grid-column', 'margin', 'display',
+    'height', 'max-height', 'min-height', 'width', 'min-width', 'max-width', 'flex', 'flex-shrink', 'flex-grow',
+    'transform', 'cursor', 'grid-template-columns', 'flex-direction', 'flex-wrap', 'align-items',
+    'justify-content', 'gap', 'space', 'overflow', 'scroll-behavior', 'border-radius', 'border-width',
+    'border-color', 'background-color', 'background-image', 'gradient-color-stops', 'object-fit', 'padding',
+    'text-align', 'font-family', 'font-size', 'font-weight', 'text-transform', 'font-style', 'letter-spacing',
+    'color', 'font-smoothing', 'opacity', 'box-shadow', 'filter', 'backdrop-filter',
+    'transition-property', 'transition-duration',
+)
+PLUGIN_RANK = {name: index for index, name in enumerate(PLUGIN_ORDER)}
+PLUGIN_PROPERTY_RES = (
+    (re.compile(r'^(margin|padding)-.*'), r'\1'),
+    (re.compile(r'^(top|right|bottom|left)$'), 'inset'),
+    (re.compile(r'^(column|row)-gap$'), 'gap'),
+    (re.compile(r'^border(-\w+)*-(radius|width)$'), r'border-\2'),
+    (re.compile(r'^-webkit-'), ''),
+    (re.compile(r'^--tw-gradient-.*'), 'gradient-color-stops'),
+)
+
+
+def compile_utility(name, theme):
+    """
+    Declarations for one utility class name (without variants)
+    Returns (selector suffix, [declarations]) or None if it isn't a known utility
+    """
+    negative = name.startswith('-')
+    base = name[1:] if negative else name
+
+    def sign(value):
+        if value is None:
+            return None
+        return f'-{value}' if negative and value not in ('0px', 'auto') else value
+
+    if not negative and base in STATIC:
+        return '', STATIC[base]
+
+    match = re.match(r'^(m|mx|my|mt|mr|mb|ml|p|px|py|pt|pr|pb|pl)-(.+)$', base)
+    if match:
+        kind, value = match.groups()
+        if negative and kind.startswith('p'):
+            return None
+        value = 'auto' if value == 'auto' and kind.startswith('m') else sign(spacing(value))
+        if value is None:
+            return None
+        prop = 'margin' if kind[0] == 'm' else 'padding'
+        sides = {'': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'), 't': ('-top',),
+                 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',)}[kind[1:]]
+        return '', [f'{prop}{side}:{value}' for side in sides]
+
+    match = re.match(r'^space-(x|y)-(.+)$', base)
+    if match:
+        axis, value = match.groups()
+        value = sign(spacing(value))
+        if value is None:
+            return None
+        if axis == 'x':
+            declarations = ['margin-right:0', f'margin-left:{value}']
+        else:
+            declarations = [f'margin-top:{value}', 'margin-bottom:0']
+        return '>:not([hidden])~:not([hidden])', declarations
+
+    match = re.match(r'^(top|right|bottom|left|inset)-(.+)$', base)
+    if match:
+        prop, value = match.groups()
+        value = 'auto' if value == 'auto' else sign(fraction(value) or spacing(value))
+        if value is None:
+            return None
+        if prop == 'inset':
+            return '', [f'{side}:{value}' for side in ('top', 'right', 'bottom', 'left')]
+        return '', [f'{prop}:{value}']
+
+    match = re.match(r'^z-(\d+|auto)$', base)
+    if match:
+        return '', [f'z-index:{sign(match.group(1))}']
+
+    match = re.match(r'^order-(\d+|first|last|none)$', base)
+    if match and not negative:
+        value = {'first': '-9999', 'last': '9999', 'none': '0'}.get(match.group(1), match.group(1))
+        return '', [f'order:{value}']
+
+    match = re.match(r'^grid-cols-(\d+)$', base)
+    if match and not negative:
+        return '', [f'grid-template-columns:repeat({match.group(1)},minmax(0,1fr))']
+
+    match = re.match(r'^col-span-(\d+|full)$', base)
+    if match and not negative:
+        value = match.group(1)
+        return '', ['grid-column:1/-1' if value == 'full' else f'grid-column:span {value}/span {value}']
+
+    match = re.match(r'^gap-(x-|y-)?(.+)$', base)
+    if match and not negative:
+        axis, value = match.groups()
+        value = spacing(value)
+        if value is None:
+            return None
+        prop = {'x-': 'column-gap', 'y-': 'row-gap', None: 'gap'}[axis]
+        return '', [f'{prop}:{value}']
+
+    match = re.match(r'^(w|h|min-h|min-w|max-h)-(.+)$', base)
+    if match and not negative:
+        prop, value = match.groups()
+        keywords = {'auto': 'auto', 'full': '100%', 'screen': '100vw' if prop.endswith('w') else '100vh',
+                    'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'}
+        value = size_value(value, keywords)
+        if value is None:
+            return None
+        css = {'w': 'width', 'h': 'height', 'min-h': 'min-height', 'min-w': 'min-width', 'max-h': 'max-height'}[prop]
+        return '', [f'{css}:{value}']
+
+    match = re.match(r'^max-w-(.+)$', base)
+    if match and not negative:
+        value = match.group(1)
+        value = MAX_WIDTHS.get(value) or (value[1:-1] if value.startswith('[') and value.endswith(']') else None)
+        return ('', [f'max-width:{value}']) if value else None
+
+    match = re.match(r'^rounded(?:-(t|b|l|r|tl|tr|bl|br))?(?:-(.+))?$', base)
+    if match and not negative:
+        side, size = match.groups()
+        if size not in (None, *RADII):
+            return None
+        value = RADII[size or '']
+        return '', [f'{prop}:{value}' for prop in RADIUS_SIDES[side or '']]
+
+    match = re.match(r'^border(?:-(t|r|b|l|x|y))?(?:-(\d+))?$', base)
+    if match and not negative:
+        side, width = match.groups()
+        width = f'{width or 1}px'
+        sides = {None: ('',), 't': ('-top',), 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',),
+                 'x': ('-left', '-right'), 'y': ('-top', '-bottom')}[side]
+        return '', [f'border{s}-width:{width}' for s in sides]
+
+    match = re.match(r'^border-(.+)$', base)
+    if match and not negative:
+        color = theme.color(match.group(1))
+        return ('', [f'border-color:{color}']) if color else None
+
+    match = re.match(r'^bg-gradient-to-(t|tr|r|br|b|bl|l|tl)$', base)
+    if match and not negative:
+        return '', [f'background-image:linear-gradient({GRADIENT_DIRECTIONS[match.group(1)]},var(--tw-gradient-stops))']
+
+    match = re.match(r'^bg-(.+)$', base)
+    if match and not negative:
+        color = theme.color(match.group(1))
+        return ('', [f'background-color:{color}']) if color else None
+
+    match = re.match(r'^(from|via|to)-(.+)$', base)
+    if match and not negative:
+        stop, value = match.groups()
+        color = theme.color(value)
+        if not color:
+            return None
+        clear = theme.transparent(value)
+        if stop == 'from':
+            return '', [f'--tw-gradient-from:{color} var(--tw-gradient-from-position)',
+                        f'--tw-gradient-to:{clear} var(--tw-gradient-to-position)',
+                        '--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)']
+        if stop == 'via':
+            return '', [f'--tw-gradient-to:{clear} var(--tw-gradient-to-position)',
+                        f'--tw-gradient-stops:var(--tw-gradient-from),{color} var(--tw-gradient-via-position),'
+                        'var(--tw-gradient-to)']
+        return '', [f'--tw-gradient-to:{color} var(--tw-gradient-to-position)']
+
+    match = re.match(r'^text-(.+)$', base)
+    if match and not negative:
+        value = match.group(1)
+        if value in FONT_SIZES:
+            size, line_height = FONT_SIZES[value]
+            return '', [f'font-size:{size}', f'line-height:{line_height}']
+        color = theme.color(value)
+        return ('', [f'color:{color}']) if color else None
+
+    match = re.match(r'^font-(.+)$', base)
+    if match and not negative and match.group(1) in FONT_WEIGHTS:
+        return '', [f'font-weight:{FONT_WEIGHTS[match.group(1)]}']
+
+    match = re.match(r'^shadow(?:-(.+))?$', base)
+    if match and not negative and (match.group(1) or '') in SHADOWS:
+        return '', [f'--tw-shadow:{SHADOWS[match.group(1) or ""]}', f'box-shadow:{BOX_SHADOW}']
+
+    match = re.match(r'^opacity-(\d+)$', base)
+    if match and not negative:
+        return '', [f'opacity:{format_number(int(match.group(1)) / 100)}']
+
+    match = re.match(r'^rotate-(\d+)$', base)
+    if match:
+        return '', [f'--tw-rotate:{sign(match.group(1) + "deg")}', 'transform:' + TRANSFORM]
+
+    match = re.match(r'^brightness-(\d+)$', base)
+    if match and not negative:
+        return '', [f'--tw-brightness:brightness({format_number(int(match.group(1)) / 100)})', 'filter:' + FILTER]
+
+    match = re.match(r'^(backdrop-)?blur(?:-(.+))?$', base)
+    if match and not negative and (match.group(2) or '') in BLURS:
+        value = f'blur({BLURS[match.group(2) or ""]})'
+        if match.group(1):
+            return '', [f'--tw-backdrop-blur:{value}', '-webkit-backdrop-filter:' + BACKDROP_FILTER,
+                        'backdrop-filter:' + BACKDROP_FILTER]
+        return '', [f'--tw-blur:{value}', 'filter:' + FILTER]
+
+    match = re.match(r'^transition(?:-(.+))?$', base)
+    if match and not negative and (match.group(1) or '') in TRANSITIONS:
+        return '', [f'transition-property:{TRANSITIONS[match.group(1) or ""]}',
+                    'transition-timing-function:cubic-bezier(.4,0,.2,1)', 'transition-duration:150ms']
+
+    match = re.match(r'^duration-(\d+)$', base)
+    if match and not negative:
+        return '', [f'transition-duration:{match.group(1)}ms']
+
+    return None
+
+
+# ==================== SCANNING & OUTPUT ====================
+
+def escape_class(name):
+    return re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', name)
+
+
+def parse_candidate(candidate):
+    """Split 'md:hover:bg-white' into (('md', 'hover'), 'bg-white')"""
+    *variants, utility = candidate.split(':')
+    return tuple(variants), utility
+
+
+def source_files():
+    base_dir = settings.BASE_DIR
+    for pattern in UTILITY_SOURCES:
+        yield from sorted(glob.glob(str(base_dir / pattern), recursive=True))
+
+
+@lru_cache(maxsize=1)
+def scan_candidates():
+    """Every token in the template/script sources that could be a class name"""
+    candidates = set()
+    for path in source_files():
+        with open(path, encoding='utf-8') as fh:
+            candidates.update(CANDIDATE_RE.findall(fh.read()))
+    return frozenset(candidates)
+
+
+def plugin_position(suffix, declarations):
+    """
+    Sort key placing a utility where Tailwind would: its plugin's index in PLUGIN_ORDER (from the
+    property it sets), then shorthands before axes before single sides (m-4, mx-auto, ml-2)
+    """
+    if suffix:
+        return PLUGIN_RANK['space'], 0, 0
+    properties = [declaration.split(':', 1)[0] for declaration in declarations]
+    prop = plugin = next((name for name in properties if not name.startswith('--')), properties[0])
+    for pattern, replacement in PLUGIN_PROPERTY_RES:
+        plugin = pattern.sub(replacement, plugin)
+    longhands = [name for name in properties if not name.startswith('--')]
+    return PLUGIN_RANK.get(plugin, len(PLUGIN_RANK)), int(prop != plugin), -len(longhands)
+
+
+def used_utilities(theme, candidates=None):
+    """
+    Compile the candidates that are valid utilities
+    Returns a list of (screen index, state key, plugin position, utility, selector, declarations),
+    in the order Tailwind emits them
+    """
+    screens = {name: index for index, (name, _) in enumerate(SCREENS, 1)}
+    rules = []
+    for candidate in candidates if candidates is not None else scan_candidates():
+        variants, utility = parse_candidate(candidate)
+        if not utility:
+            continue
+        compiled = compile_utility(utility, theme)
+        if compiled is None:
+            continue
+        suffix, declarations = compiled
+        screen, states, group = 0, '', False
+        valid = True
+        for variant in variants:
+            if variant in screens and not screen:
+                screen = screens[variant]
+            elif variant in STATE_VARIANTS:
+                states += STATE_VARIANTS[variant]
+            elif variant == 'group-hover':
+                group = True
+            else:
+                valid = False
+        if not valid:
+            continue
+        selector = f'.{escape_class(candidate)}{states}{suffix}'
+        if group:
+            selector = f'.group:hover {selector}'
+        state_key = (bool(states) or group, group)
+        rules.append((screen, state_key, plugin_position(suffix, declarations), utility, selector, declarations))
+    rules.sort(key=lambda rule: rule[:4])
+    return rules
+
+
+def build_utility_css(colors, candidates=None):
+    """Minified preflight + the utilities used by the templates, for the given theme colours"""
+    theme = Theme(colors)
+    media = {0: ''}
+    for index, (_, width) in enumerate(SCREENS, 1):
+        media[index] = f'@media (min-width:{width}px)'
+    output = [PREFLIGHT]
+    blocks = {}
+    for screen, _, _, _, selector, declarations in used_utilities(theme, candidates):
+        blocks.setdefault(screen, []).append(f'{selector}{{{";".join(declarations)}}}')
+    for screen in sorted(blocks):
+        body = ''.join(blocks[screen])
+        output.append(f'{media[screen]}{{{body}}}' if screen else body)
+    return ''.join(output)
+
+
+@lru_cache(maxsize=1)
+def candidates_digest():
+    return hashlib.sha1('\0'.join(sorted(scan_candidates())).encode()).hexdigest()
+
+
+def utility_css_key(colors):
+    """Changes when the theme colours, the class names used by the templates or the compiler change"""
+    digest = hashlib.sha1(repr((UTILITY_CSS_SCHEMA, sorted(colors.items()))).encode())
+    digest.update(candidates_digest().encode())
+    return digest.hexdigest()[:16]
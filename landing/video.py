@@ -0,0 +1,298 @@
+"""
+Video metadata probing for RoyalERP Landing Page
+Reads MIME type, dimensions and duration from MP4/MOV and WebM/Matroska container headers
+in pure Python, seeking past media data so large uploads are never read in full
+"""
+import mimetypes
+import os
+import struct
+
+
+# Video fields that get probed, per model name
+VIDEO_FIELDS = {
+    'SectionBlock': ('video',),
+}
+
+# Bump when the stored metadata layout changes so existing rows are re-probed
+VIDEO_META_SCHEMA = 2
+
+# Container types browsers answer canPlayType('') for, mapped to the type they do play them as
+# (a QuickTime file with H.264 is an MP4 to Chrome/Firefox, Matroska with VP8/VP9 a WebM)
+PLAYABLE_MIME = {
+    'video/quicktime': 'video/mp4',
+    'video/x-matroska': 'video/webm',
+}
+
+# Matroska timestamps default to milliseconds (TimestampScale is in nanoseconds)
+DEFAULT_TIMESTAMP_SCALE = 1000000
+
+
+class VideoProbeError(ValueError):
+    pass
+
+
+def meta_field(field_name):
+    """Name of the JSONField storing the metadata of `field_name`"""
+    return f'{field_name}_meta'
+
+
+# ==================== MP4 / QUICKTIME ====================
+
+# Boxes that only contain other boxes, on the path to mvhd/tkhd/hdlr
+MP4_CONTAINERS = {b'moov', b'trak', b'mdia'}
+
+
+def iter_boxes(fh, end):
+    """Yield (type, payload start, payload end) for the ISO-BMFF boxes up to `end`"""
+    while fh.tell() + 8 <= end:
+        start = fh.tell()
+        size, box_type = struct.unpack('>I4s', fh.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', fh.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - start  # Box runs to the end of the file
+        if size < header:
+            raise VideoProbeError('Corrupt MP4 box size')
+        yield box_type, start + header, min(start + size, end)
+        fh.seek(start + size)
+
+
+def parse_mvhd(data):
+    version = data[0]
+    if version == 1:
+        timescale, duration = struct.unpack('>IQ', data[20:32])
+    else:
+        timescale, duration = struct.unpack('>II', data[12:20])
+    return duration / timescale if timescale else None
+
+
+def parse_tkhd(data):
+    """Display size of a track, swapped when the matrix rotates it by 90 degrees"""
+    matrix_offset = 52 if data[0] == 1 else 40
+    a, b = struct.unpack('>ii', data[matrix_offset:matrix_offset + 8])
+    width, height = struct.unpack('>II', data[-8:])
+    width, height = round(width / 65536), round(height / 65536)
+    if a == 0 and abs(b) == 0x10000:
+        width, height = height, width
+    return width, height
+
+
+def probe_mp4(fh, size):
+    fh.seek(0)
+    meta = {'mime': 'video/mp4'}
+
+    def walk(end, track):
+        for box_type, start, box_end in iter_boxes(fh, end):
+            if box_type == b'mvhd':
+                meta['duration'] = parse_mvhd(fh.read(box_end - start))
+            elif box_type == b'tkhd':
+                track['size'] = parse_tkhd(fh.read(box_end - start))
+            elif box_type == b'hdlr':
+                track['handler'] = fh.read(12)[8:12]
+            elif box_type in MP4_CONTAINERS:
+                if box_type == b'trak':
+                    child = {}
+                    walk(box_end, child)
+                    if child.get('handler') == b'vide' and 'size' in child and 'width' not in meta:
+                        meta['width'], meta['height'] = child['size']
+                else:
+                    walk(box_end, track)
+                    if box_type == b'moov':
+                        return True  # Everything we need lives in moov
+            fh.seek(box_end)
+        return False
+
+    walk(size, {})
+    return meta
+
+
+# ==================== WEBM / MATROSKA ====================
+
+EBML_HEADER = 0x1A45DFA3
+SEGMENT = 0x18538067
+SEGMENT_INFO = 0x1549A966
+TIMESTAMP_SCALE = 0x2AD7B1
+DURATION = 0x4489
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_TYPE = 0x83
+TRACK_VIDEO = 0xE0
+PIXEL_WIDTH = 0xB0
+PIXEL_HEIGHT = 0xBA
+DISPLAY_WIDTH = 0x54B0
+DISPLAY_HEIGHT = 0x54BA
+CLUSTER = 0x1F43B675
+
+
+def read_vint(fh, keep_marker):
+    """Read an EBML variable-length integer; returns (value, is_unknown_size)"""
+    first = fh.read(1)
+    if not first:
+        raise VideoProbeError('Unexpected end of WebM data')
+    first = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        length += 1
+        mask >>= 1
+    if length > 8:
+        raise VideoProbeError('Invalid EBML integer')
+    value = first if keep_marker else first & (mask - 1)
+    for byte in fh.read(length - 1):
+        value = (value << 8) | byte
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, unknown
+
+
+def iter_elements(fh, end):
+    """Yield (id, payload start, payload end) for the EBML elements up to `end`"""
+    while fh.tell() < end:
+        element_id, _ = read_vint(fh, keep_marker=True)
+        size, unknown = read_vint(fh, keep_marker=False)
+        start = fh.tell()
+        element_end = end if unknown else min(start + size, end)
+        yield element_id, start, element_end
+        fh.seek(element_end)
+
+
+def read_uint(fh, start, end):
+    fh.seek(start)
+    return int.from_bytes(fh.read(end - start), 'big')
+
+
+def read_float(fh, start, end):
+    fh.seek(start)
+    data = fh.read(end - start)
+    if len(data) == 4:
+        return struct.unpack('>f', data)[0]
+    if len(data) == 8:
+        return struct.unpack('>d', data)[0]
+    return None
+
+
+def probe_matroska(fh, size):
+    fh.seek(0)
+    meta = {'mime': 'video/webm'}
+    for element_id, start, end in iter_elements(fh, size):
+        if element_id == SEGMENT:
+            probe_segment(fh, end, meta)
+            break
+    return meta
+
+
+def probe_segment(fh, end, meta):
+    scale, duration = DEFAULT_TIMESTAMP_SCALE, None
+    for element_id, start, element_end in iter_elements(fh, end):
+        if element_id == SEGMENT_INFO:
+            for child_id, child_start, child_end in iter_elements(fh, element_end):
+                if child_id == TIMESTAMP_SCALE:
+                    scale = read_uint(fh, child_start, child_end)
+                elif child_id == DURATION:
+                    duration = read_float(fh, child_start, child_end)
+        elif element_id == TRACKS:
+            for child_id, child_start, child_end in iter_elements(fh, element_end):
+                if child_id == TRACK_ENTRY and 'width' not in meta:
+                    probe_track(fh, child_end, meta)
+        elif element_id == CLUSTER:
+            break  # Media data; Info and Tracks come before it
+    if duration is not None:
+        meta['duration'] = duration * scale / 1e9
+
+
+def probe_track(fh, end, meta):
+    track_type, sizes = None, {}
+    for element_id, start, element_end in iter_elements(fh, end):
+        if element_id == TRACK_TYPE:
+            track_type = read_uint(fh, start, element_end)
+        elif element_id == TRACK_VIDEO:
+            for child_id, child_start, child_end in iter_elements(fh, element_end):
+                if child_id in (PIXEL_WIDTH, PIXEL_HEIGHT, DISPLAY_WIDTH, DISPLAY_HEIGHT):
+                    sizes[child_id] = read_uint(fh, child_start, child_end)
+    if track_type == 1 and PIXEL_WIDTH in sizes and PIXEL_HEIGHT in sizes:
+        meta['width'] = sizes.get(DISPLAY_WIDTH, sizes[PIXEL_WIDTH])
+        meta['height'] = sizes.get(DISPLAY_HEIGHT, sizes[PIXEL_HEIGHT])
+
+
+# ==================== PROBING ====================
+
+def probe_video(fh):
+    """
+    Inspect an open binary video file
+    Returns {'mime', 'width', 'height', 'duration'}; keys that can't be determined are omitted
+    """
+    fh.seek(0, os.SEEK_END)
+    size = fh.tell()
+    fh.seek(0)
+    head = fh.read(12)
+    try:
+        if head[4:8] == b'ftyp':
+            meta = probe_mp4(fh, size)
+        elif head[:4] == struct.pack('>I', EBML_HEADER):
+            meta = probe_matroska(fh, size)
+        elif head[:4] == b'OggS':
+            meta = {'mime': 'video/ogg'}
+        else:
+            raise VideoProbeError('Unrecognised video container')
+    except struct.error:
+        raise VideoProbeError('Truncated video header')
+    if meta.get('duration') is not None:
+        meta['duration'] = round(meta['duration'], 3)
+    return {key: value for key, value in meta.items() if value is not None}
+
+
+def playable_mime(mime):
+    return PLAYABLE_MIME.get(mime, mime)
+
+
+def guess_mime(name):
+    """MIME type for a <source> from the file extension alone"""
+    return playable_mime(mimetypes.guess_type(name)[0] or 'video/mp4')
+
+
+def build_video_meta(file):
+    file.open('rb')
+    try:
+        try:
+            meta = probe_video(file)
+        except VideoProbeError:
+            # Unknown container: fall back to the extension so the browser still gets a type
+            meta = {'mime': guess_mime(file.name)}
+    finally:
+        file.close()
+    return {'schema': VIDEO_META_SCHEMA, 'source': file.name, **meta}
+
+
+def outdated_video_fields(instance):
+    """Video fields of `instance` whose stored metadata doesn't match the current file"""
+    fields = []
+    for field_name in VIDEO_FIELDS.get(type(instance).__name__, ()):
+        file = getattr(instance, field_name)
+        current = getattr(instance, meta_field(field_name)) or {}
+        if not file:
+            if current:
+                fields.append(field_name)
+        elif current.get('source') != file.name or current.get('schema') != VIDEO_META_SCHEMA:
+            fields.append(field_name)
+    return fields
+
+
+def update_video_meta(instance):
+    """
+    Probe every video field of `instance` whose file changed
+    Stored with a queryset update so no further save signals fire
+    Returns the list of updated metadata fields
+    """
+    updates = {}
+    for field_name in outdated_video_fields(instance):
+        file = getattr(instance, field_name)
+        target = meta_field(field_name)
+        meta = build_video_meta(file) if file else {}
+        if meta != (getattr(instance, target) or {}):
+            updates[target] = meta
+    if updates:
+        type(instance).objects.filter(pk=instance.pk).update(**updates)
+        for target, meta in updates.items():
+            setattr(instance, target, meta)
+    return list(updates)
@@ -1,68 +1,84 @@
 """
 Views for RoyalERP Landing Page
-Loads all admin-driven content and passes to template
+Renders admin-driven content from the packed snapshot file when one is published,
+otherwise from the shared content snapshot built from the database
 """
+from django.http import HttpResponse
 from django.shortcuts import render
-from django.db.models import Q
-from collections import defaultdict
-from .models import (
-    LandingPageSettings, Feature, SectionBlock, UseCasePoint,
-    Integration, PricingPlan, Testimonial, StatCounter, FAQ, FooterLink, SectionImage
-)
+from django.views.decorators.http import condition
+from .assets import update_generated_assets
+from .cache import critical_css_enabled, get_content_version, get_cached_page, get_last_modified, page_cache_enabled, set_cached_page
+from .critical_css import get_critical_css
+from .fragments import render_fragments
+from .models import LandingPageSettings
+from .packed import get_packed_snapshot
+from .sections import get_active_sections
+from .snapshot import get_snapshot
 
 
+def landing_etag(request):
+    """
+    The content version (or snapshot file version) identifies the rendered HTML
+    Both include the code fingerprint, so after a deploy revalidation gets the new markup, not a 304
+    """
+    packed = get_packed_snapshot()
+    return packed.version if packed else get_content_version()
+
+
+def landing_last_modified(request):
+    packed = get_packed_snapshot()
+    return packed.last_modified if packed else get_last_modified()
+
+
+@condition(etag_func=landing_etag, last_modified_func=landing_last_modified)
 def landing_page(request):
     """
     Main landing page view
-    Loads singleton settings and all active ordered items
+    Answers conditional requests with 304 from cached validators (no rendering, no content queries)
+    Serves cached HTML for the current content version when page caching is on
     """
-    # Load singleton settings (creates default if not exists)
-    settings = LandingPageSettings.load()
-    
-    # Load all active items, ordered
-    features = Feature.objects.filter(is_active=True).order_by('order')
-    
-    # Load section blocks and organize by key for easy template access
-    sections_qs = SectionBlock.objects.filter(is_active=True).order_by('order')
-    sections = {section.key: section for section in sections_qs}
-    sections_list = list(sections_qs)  # Also provide as list for iteration
-    
-    use_cases = UseCasePoint.objects.filter(is_active=True).order_by('order')
-    integrations = Integration.objects.filter(is_active=True).order_by('order')
-    plans = PricingPlan.objects.filter(is_active=True).order_by('order')
-    testimonials = Testimonial.objects.filter(is_active=True).order_by('order')
-    stats = StatCounter.objects.filter(is_active=True).order_by('order')
-    faqs = FAQ.objects.filter(is_active=True).order_by('order')
-    
-    # Organize footer links by column
-    footer_links_qs = FooterLink.objects.filter(is_active=True).order_by('column_name', 'order')
-    footer_links = defaultdict(list)
-    for link in footer_links_qs:
-        footer_links[link.column_name].append(link)
-    footer_links = dict(footer_links)  # Convert to regular dict for template
-    
-    # Load section images organized by section
-    section_images_qs = SectionImage.objects.filter(is_active=True).order_by('section', 'order')
-    section_images = defaultdict(list)
-    for img in section_images_qs:
-        section_images[img.section].append(img)
-    section_images = dict(section_images)  # Convert to regular dict
+    if not page_cache_enabled() or request.method not in ('GET', 'HEAD'):
+        return render_landing_page(request)
     
+    # Read the version before rendering so an edit made mid-render
+    # leaves this render's HTML under the old (now unused) version
+    packed = get_packed_snapshot()
+    version = packed.version if packed else get_content_version()
+    content = get_cached_page(version)
+    if content is None:
+        response = render_landing_page(request, packed)
+        set_cached_page(version, response.content)
+        return response
+    return HttpResponse(content)
+
+
+def render_landing_page(request, packed=None):
+    """
+    Render the landing page from cached section fragments
+    Only fragments whose dependencies changed are rendered, from the shared content snapshot
+    With a packed snapshot file nothing touches the database: settings, content, the version
+    and the fragment keys all come from the file
+    The navbar/hero CSS is inlined and the full stylesheets load asynchronously
+    """
+    packed = packed or get_packed_snapshot()
+    if packed:
+        version = packed.version
+        landing_settings = packed.settings  # Generated assets were brought up to date when it was written
+        page_sections = packed.snapshot.page_sections
+        section_fragments = render_fragments(
+            request, page_sections, packed.snapshot.get_context, versions=packed.dependencies
+        )
+    else:
+        version = get_content_version()
+        landing_settings = LandingPageSettings.load()
+        update_generated_assets(landing_settings)  # No-op unless the templates or theme colours changed
+        page_sections = get_active_sections()
+        section_fragments = render_fragments(request, page_sections, lambda: get_snapshot().get_context())
     context = {
-        'settings': settings,
-        'features': features,
-        'sections': sections,
-        'sections_list': sections_list,
-        'use_cases': use_cases,
-        'integrations': integrations,
-        'plans': plans,
-        'pricing_plans': plans,  # Alias for template compatibility
-        'testimonials': testimonials,
-        'reviews': testimonials,  # Alias for template compatibility
-        'stats': stats,
-        'faqs': faqs,
-        'footer_links': footer_links,
-        'section_images': section_images,  # Images organized by section
+        'settings': landing_settings,
+        'page_sections': page_sections,
+        'section_fragments': section_fragments,
     }
-    
+    if critical_css_enabled():
+        context['critical_css'] = get_critical_css(request, context, version, page_sections, section_fragments)
     return render(request, 'landing/index.html', context)
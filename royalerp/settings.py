@@ -61,9 +61,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections (and their page cache and pragmas) across requests in production
+        'CONN_MAX_AGE': 0 if DEBUG else 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,  # Seconds a connection waits on a lock before "database is locked"
+        },
     }
 }
 
+# Cache shared by every process (web workers, manage.py commands, media workers): the content and
+# dependency versions, Last-Modified and the singletons live here, so a save made by one process
+# must be seen by all of them. A process-local backend (LocMemCache) serves stale pages and
+# per-worker ETags; use a file, database, Redis or Memcached cache (checked by landing.W001)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('LANDING_CACHE_DIR') or BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,  # Culling drops random keys; a dropped version only invalidates
+        },
+    }
+}
+
+# SQLite production profile, applied to every new connection (landing.database.apply_sqlite_pragmas)
+LANDING_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',  # Readers keep reading while the admin writes
+    'synchronous': 'NORMAL',  # Durable with WAL; fsync only at checkpoints
+    'busy_timeout': 20000,  # Milliseconds a writer waits for another writer
+    'cache_size': -64000,  # Negative means KiB: 64 MB page cache per connection
+    'mmap_size': 256 * 1024 * 1024,  # Read pages through a memory map
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -83,9 +112,51 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Hashed file names plus .gz/.br siblings, written by collectstatic (landing.storage)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'landing.storage.CompressedManifestStaticFilesStorage'},
+}
+
 # Media files (Uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Landing page full-page HTML cache (invalidated on every content save/delete)
+LANDING_PAGE_CACHE = not DEBUG
+LANDING_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+# Per-process content snapshot, rebuilt when the shared content version changes (off: load per render)
+LANDING_CONTENT_SNAPSHOT = not DEBUG
+# LandingPageSettings is read through the cache for at most this long between invalidations
+LANDING_SINGLETON_CACHE_TIMEOUT = 60 * 5
+# Per-section fragment cache (a fragment is invalidated only by the content it depends on)
+LANDING_FRAGMENT_CACHE = not DEBUG
+
+# Static export (python manage.py export_landing); when set, admin saves re-export changed artifacts
+LANDING_EXPORT_DIR = os.environ.get('LANDING_EXPORT_DIR') or None
+LANDING_EXPORT_BASE_URL = os.environ.get('LANDING_EXPORT_BASE_URL', '')
+
+# Packed content snapshot (python manage.py write_landing_snapshot); when set, admin saves rewrite it
+# and the landing view renders from it without a database connection (rewrite it after each deploy)
+LANDING_SNAPSHOT_FILE = os.environ.get('LANDING_SNAPSHOT_FILE') or None
+
+# Background media processing threads per process (0 runs jobs inline after commit)
+LANDING_MEDIA_WORKERS = 2
+# Seconds between checks for queued jobs and jobs left RUNNING by a worker that died (0 disables)
+LANDING_MEDIA_RECHECK_INTERVAL = 60 * 5
+
+# Media serving through Django (landing.media.serve_media)
+LANDING_SERVE_MEDIA = True
+# None, 'x-accel-redirect' (nginx, internal location at LANDING_MEDIA_ACCEL_PREFIX) or 'x-sendfile'
+LANDING_MEDIA_OFFLOAD = os.environ.get('LANDING_MEDIA_OFFLOAD') or None
+LANDING_MEDIA_ACCEL_PREFIX = '/protected-media/'
+LANDING_MEDIA_MAX_AGE = 60 * 60
+# Serve collected static files through Django when DEBUG is off (landing.media.serve_static)
+LANDING_SERVE_STATIC = True
+LANDING_IMMUTABLE_MEDIA_PREFIXES = ('landing/variants/', 'landing/thumbnails/', 'landing/generated/')
+
+# Inline the navbar/hero CSS and load the full stylesheets asynchronously
+LANDING_CRITICAL_CSS = True